@@ -0,0 +1,509 @@
+"""
+This module provides functionality for downloading many files concurrently using asyncio and aiohttp.
+
+It includes a coroutine `download_many` which downloads a list of URLs to a list of destinations over a single
+shared connection pool, a coroutine `download_file_async` which downloads a single file with the same
+resume-and-retry mechanism as `download.py`, and a `main` function for handling command line arguments.
+
+Each downloaded file is verified against the SHA-256 hash of its pointer file, as in `download.py`, unless
+`--skip_checksum` is given. Downloaded ZIP files can optionally be extracted on a thread pool as soon as each download completes, so
+extraction overlaps with the downloads still in progress instead of running after all of them.
+
+Usage:
+    Run this module from the command line with a text file containing one URL per line.
+    Example:
+        python async_download.py urls.txt ./download --concurrency 16 --max_retries 5 --retry_delay 30 --backoff_cap 600 --timeout 60 --unzip
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import itertools
+import logging
+import os
+import sys
+import traceback
+from typing import Dict, List, Literal, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiofiles
+import aiohttp
+from tqdm import tqdm
+
+sys.path.append(os.getcwd())
+
+
+from utils.checksum import perform_checksum
+from utils.create_directory import create_directory
+from utils.downloader import (
+    DEFAULT_BACKOFF_CAP,
+    RETRYABLE_STATUS_CODES,
+    FileHasher,
+    get_retry_delay,
+    parse_retry_after,
+)
+from utils.logger_config import setup_logger
+from utils.unzip_file import extract_zip_file_recursive
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_CONCURRENCY = 16
+
+
+async def download_file_async(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    logger: logging.Logger,
+    url: str,
+    destination: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_retries: Optional[int] = None,
+    retry_delay: int = 60,
+    backoff_cap: int = DEFAULT_BACKOFF_CAP,
+    hash_name: Optional[str] = None,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Download a file from a given URL with retry mechanism, resuming from any partially downloaded file.
+
+    Args:
+        session (aiohttp.ClientSession): Session whose connection pool is shared by all downloads.
+        semaphore (asyncio.Semaphore): Semaphore limiting the number of concurrent downloads.
+        logger (logging.Logger): Logger object for logging.
+        url (str): The URL of the file to download.
+        destination (str): The path where the downloaded file will be saved.
+        chunk_size (int, optional): Size of each chunk to download in bytes. Default is 1 MiB.
+        max_retries (Optional[int]): Maximum number of retry attempts upon failure. Default is None (unbounded).
+        retry_delay (int, optional): Base delay between retry attempts in seconds, doubled after every
+            failed attempt and randomly jittered. Default is 60.
+        backoff_cap (int, optional): Upper bound of the retry backoff in seconds. Default is 600.
+        hash_name (Optional[str]): Name of a hashlib algorithm (e.g. "sha256") used to hash the file while it is
+            downloaded, so it does not need to be read again for a checksum. Default is None (no hashing).
+
+    Returns:
+        Tuple[bool, Optional[str]]: True if the download is successful or already completed, False otherwise,
+            and the hexadecimal digest of the downloaded file if `hash_name` was given and the download succeeded.
+    """
+    async with semaphore:
+        logger.info(
+            "Download file process initiated (url: '%s', destination: '%s')",
+            url,
+            destination,
+        )
+
+        # Downloaded bytes are tracked in memory across retries, the file is only stat'ed once
+        downloaded_bytes: int = (
+            os.path.getsize(destination) if os.path.exists(destination) else 0
+        )
+
+        create_directory(destination=destination, logger=logger)
+
+        file_hasher: Optional[FileHasher] = (
+            FileHasher(hash_name, destination) if hash_name else None
+        )
+
+        attempts = (
+            itertools.count(1) if max_retries is None else range(1, max_retries + 1)
+        )
+        for retry_count in attempts:
+            resume_header: Dict[str, str] = {}
+            if downloaded_bytes:
+                resume_header["Range"] = f"bytes={downloaded_bytes}-"
+
+            try:
+                async with session.get(url, headers=resume_header) as response:
+                    if response.status == 416:
+                        logger.info(
+                            "(416 Range Not Satisfiable) The file has already been fully downloaded. (url: '%s')",
+                            url,
+                        )
+
+                        if file_hasher is not None:
+                            await asyncio.to_thread(file_hasher.sync, downloaded_bytes)
+
+                        return True, file_hasher.hexdigest() if file_hasher else None
+
+                    response.raise_for_status()
+
+                    mode: Literal["ab", "wb"] = "ab"
+                    if resume_header and response.status == 200:
+                        # The server ignored the Range header and is sending the whole file
+                        logger.warning(
+                            "Server does not support resuming, restarting download from the beginning (destination: '%s')",
+                            destination,
+                        )
+                        mode = "wb"
+                        downloaded_bytes = 0
+
+                    if file_hasher is not None:
+                        # Hash the bytes already on disk that the hash does not cover yet (reading them off the
+                        # event loop)
+                        await asyncio.to_thread(file_hasher.sync, downloaded_bytes)
+
+                    # Write to file in "append binary" ("ab") or "write binary" ("wb") mode
+                    async with aiofiles.open(destination, mode) as file:
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            await file.write(chunk)
+                            downloaded_bytes += len(chunk)
+                            if file_hasher is not None:
+                                file_hasher.update(chunk)
+
+                logger.info(
+                    "Download file process successfully completed (url: '%s', destination: '%s')",
+                    url,
+                    os.path.abspath(destination),
+                )
+
+                return True, file_hasher.hexdigest() if file_hasher else None
+
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRYABLE_STATUS_CODES:
+                    # Permanent failure (e.g. 403 or 404), retrying cannot succeed
+                    logger.error(
+                        "An error occurred during the download file process: %s (url: '%s')",
+                        e,
+                        url,
+                    )
+
+                    return False, None
+
+                error: Exception = e
+                retry_after = parse_retry_after(e.headers)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+                retry_after = None
+
+            logger.error(
+                "An error occurred during the download file process: %s (url: '%s', retry_count: %s, max_retries: %s)",
+                error,
+                url,
+                retry_count,
+                max_retries,
+            )
+
+            if max_retries is None or retry_count < max_retries:
+                delay = get_retry_delay(
+                    retry_count, retry_delay, backoff_cap, retry_after
+                )
+                logger.warning("Retrying download in %.1f seconds...", delay)
+                await asyncio.sleep(delay)
+
+        logger.warning(
+            "Max retries (%s) reached. Download terminated (url: '%s').",
+            max_retries,
+            url,
+        )
+
+        return False, None
+
+
+async def download_many(
+    urls: List[str],
+    destinations: List[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    logger: Optional[logging.Logger] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_retries: Optional[int] = None,
+    retry_delay: int = 60,
+    backoff_cap: int = DEFAULT_BACKOFF_CAP,
+    timeout: int = 60,
+    unzip_destination: Optional[str] = None,
+    max_recursion_depth: int = 1,
+    checksum: bool = True,
+) -> List[bool]:
+    """
+    Download many files concurrently over a single shared connection pool.
+
+    If `checksum` is set, each file is hashed while it is downloaded and the hash is verified against the SHA-256
+    hash of its pointer file (see `download.py`) on a thread pool as soon as its download completes. If `unzip_destination` is given, each verified file is then
+    extracted on the thread pool, while the remaining downloads continue.
+
+    Args:
+        urls (List[str]): The URLs of the files to download.
+        destinations (List[str]): The paths where the downloaded files will be saved, one per URL.
+        concurrency (int, optional): Maximum number of concurrent downloads. Default is 16.
+        logger (Optional[logging.Logger]): Logger instance for logging. If not provided, the root logger is used.
+        chunk_size (int, optional): Size of each chunk to download in bytes. Default is 1 MiB.
+        max_retries (Optional[int]): Maximum number of retry attempts upon failure. Default is None (unbounded).
+        retry_delay (int, optional): Base delay between retry attempts in seconds, doubled after every
+            failed attempt and randomly jittered. Default is 60.
+        backoff_cap (int, optional): Upper bound of the retry backoff in seconds. Default is 600.
+        timeout (int, optional): Maximum waiting time for server response in seconds. Default is 60.
+        unzip_destination (Optional[str]): Directory to extract the downloaded ZIP files to. Default is None
+            (no extraction).
+        max_recursion_depth (int, optional): Maximum recursion depth for nested ZIP files. Default is 1.
+        checksum (bool, optional): Whether to verify each downloaded file against its pointer file. Default is True.
+
+    Returns:
+        List[bool]: Whether each download (and checksum and extraction, if enabled) succeeded, in the order of
+            `urls`.
+
+    Raises:
+        ValueError: If the number of URLs and destinations differ.
+    """
+    if len(urls) != len(destinations):
+        raise ValueError(
+            f"Expected one destination per URL. Received {len(urls)} URLs and {len(destinations)} destinations"
+        )
+
+    if logger is None:
+        logger = logging.getLogger()  # Get the root logger
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+    client_timeout = aiohttp.ClientTimeout(
+        total=None, sock_connect=timeout, sock_read=timeout
+    )
+
+    loop = asyncio.get_running_loop()
+
+    # Request unencoded bodies: resumed downloads send the size of the file on disk as the Range offset, which only
+    # matches the bytes the server sends if no content encoding is applied (as in `utils/downloader.py`)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=client_timeout,
+        headers={"Accept-Encoding": "identity"},
+    ) as session:
+        with tqdm(
+            total=len(urls), unit="file"
+        ) as progress_bar, concurrent.futures.ThreadPoolExecutor() as executor:
+
+            async def verify(
+                url: str, destination: str, file_hash: Optional[str]
+            ) -> bool:
+                # Pointer files are served under "raw" instead of "resolve"
+                pointer_file_url = url.replace("resolve", "raw").split("?")[0]
+
+                try:
+                    checksum_succeeded = await loop.run_in_executor(
+                        executor,
+                        functools.partial(
+                            perform_checksum,
+                            file_path=destination,
+                            pointer_file_url=pointer_file_url,
+                            logger=logger,
+                            file_hash=file_hash,
+                        ),
+                    )
+
+                except Exception as e:
+                    logger.error(
+                        "An error occurred during the checksum of '%s': %s",
+                        destination,
+                        e,
+                    )
+
+                    return False
+
+                if not checksum_succeeded:
+                    logger.error("Checksum process failed for file: '%s'", destination)
+
+                return checksum_succeeded
+
+            async def extract(destination: str, extract_directory: str) -> bool:
+                extract_to = os.path.join(
+                    extract_directory,
+                    os.path.splitext(os.path.basename(destination))[0],
+                )
+
+                try:
+                    await loop.run_in_executor(
+                        executor,
+                        functools.partial(
+                            extract_zip_file_recursive,
+                            zip_file=destination,
+                            extract_to=extract_to,
+                            current_recursion_depth=-1,
+                            max_recursion_depth=max_recursion_depth,
+                            logger=logger,
+                        ),
+                    )
+
+                except Exception as e:
+                    logger.error(
+                        "An error occurred during the extraction of '%s': %s",
+                        destination,
+                        e,
+                    )
+
+                    return False
+
+                return True
+
+            async def download(url: str, destination: str) -> bool:
+                succeeded, file_hash = await download_file_async(
+                    session=session,
+                    semaphore=semaphore,
+                    logger=logger,
+                    url=url,
+                    destination=destination,
+                    chunk_size=chunk_size,
+                    max_retries=max_retries,
+                    retry_delay=retry_delay,
+                    backoff_cap=backoff_cap,
+                    hash_name="sha256" if checksum else None,
+                )
+                if succeeded and checksum:
+                    # Verify in the background, the event loop keeps serving the other downloads
+                    succeeded = await verify(url, destination, file_hash)
+
+                if succeeded and unzip_destination is not None:
+                    # Extract in the background, the event loop keeps serving the other downloads
+                    succeeded = await extract(destination, unzip_destination)
+
+                progress_bar.update(1)
+
+                return succeeded
+
+            return await asyncio.gather(
+                *(download(url, dest) for url, dest in zip(urls, destinations))
+            )
+
+
+def main():
+    try:
+        parser = argparse.ArgumentParser(
+            description="Download many files concurrently with retry mechanism."
+        )
+        parser.add_argument(
+            "url_file", type=str, help="Path to a text file with one URL per line"
+        )
+        parser.add_argument(
+            "destination_directory",
+            type=str,
+            help="Directory to save the downloaded files to",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help="Maximum number of concurrent downloads",
+        )
+        parser.add_argument(
+            "--chunk_size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Size of each download chunk in bytes",
+        )
+        parser.add_argument(
+            "--max_retries",
+            type=int,
+            default=None,
+            help="Maximum number of retry attempts upon failure (unbounded by default)",
+        )
+        parser.add_argument(
+            "--retry_delay",
+            type=int,
+            default=10,
+            help="Base delay between retry attempts in seconds (exponential backoff with jitter)",
+        )
+        parser.add_argument(
+            "--backoff_cap",
+            type=int,
+            default=DEFAULT_BACKOFF_CAP,
+            help="Upper bound of the retry backoff in seconds",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=60,
+            help="Maximum waiting time for server response in seconds",
+        )
+        parser.add_argument(
+            "--yaml_config_path",
+            type=str,
+            default="configs/logging.yaml",
+            help="Path to yaml_config_path for logger.",
+        )
+        parser.add_argument(
+            "--skip_checksum",
+            action="store_true",
+            help="Do not verify the downloaded files against their pointer files.",
+        )
+        parser.add_argument(
+            "--unzip",
+            action="store_true",
+            help="Unzip each file as soon as its download (and checksum) completes.",
+        )
+        parser.add_argument(
+            "--unzip_destination",
+            type=str,
+            default="unzip",
+            help="Path to extract zip files to.",
+        )
+        parser.add_argument(
+            "--max_recursion_depth",
+            type=int,
+            default=1,
+            help="Maximum number of recursions before raising an error.",
+        )
+
+        args: argparse.Namespace = parser.parse_args()
+        print(f"args: {args}")
+
+        concurrency: int = args.concurrency
+        if concurrency < 1:
+            raise ValueError(
+                f"The download concurrency must be at least 1. Received {concurrency}"
+            )
+
+        if args.backoff_cap < 0:
+            raise ValueError(
+                f"The retry backoff cap cannot be negative. Received {args.backoff_cap}"
+            )
+
+        with open(args.url_file, "r", encoding="utf-8") as f:
+            urls: List[str] = [line.strip() for line in f if line.strip()]
+
+        destinations: List[str] = [
+            os.path.join(
+                args.destination_directory, os.path.basename(urlparse(url).path)
+            )
+            for url in urls
+        ]
+
+        # Set up logging
+        logger: logging.Logger = setup_logger(
+            yaml_config_path=args.yaml_config_path,
+            log_output_file_path=args.destination_directory,
+        )
+        assert (
+            logger.handlers
+        ), f"Log configuration failed to assign handlers (config: {args.yaml_config_path})"
+
+        results: List[bool] = asyncio.run(
+            download_many(
+                urls=urls,
+                destinations=destinations,
+                concurrency=concurrency,
+                logger=logger,
+                chunk_size=args.chunk_size,
+                max_retries=args.max_retries,
+                retry_delay=args.retry_delay,
+                backoff_cap=args.backoff_cap,
+                timeout=args.timeout,
+                unzip_destination=args.unzip_destination if args.unzip else None,
+                max_recursion_depth=args.max_recursion_depth,
+                checksum=not args.skip_checksum,
+            )
+        )
+
+        failed: List[str] = [url for url, ok in zip(urls, results) if not ok]
+        if failed:
+            raise Exception(f"Download failed for {len(failed)} file(s): {failed}")
+
+    except KeyboardInterrupt:
+        logger.warning("Keyboard interrupt received. Exiting gracefully.")
+
+    except Exception as e:
+        # Log the exception traceback
+        traceback_str = traceback.format_exc()
+        logger.error("An unexpected error occurred: %s", e)
+        logger.error("Traceback: %s", traceback_str)
+
+        # Gracefully exit with an appropriate error message
+        sys.exit("Exiting due to an unexpected error.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,150 +1,41 @@
 """
 This module provides functionality for downloading files with a retry mechanism and optionally extracting ZIP files.
 
-It includes a function `download_file_with_retry` for downloading a file from a given URL with a retry mechanism,
-and a `main` function for handling command line arguments and starting the download process.
+It provides a `main` function for handling command line arguments and starting the download process. The download
+itself is implemented by `download_file_with_retry` (single connection) and `download_file_parallel`
+(concurrent byte ranges) in `utils/downloader.py`.
 
 Usage:
     Run this module from the command line with appropriate arguments to download files with retry mechanism.
     Example:
-        python download.py http://example.com/file.zip ./output/file.zip --unzip --track_extraction --chunk_size 8192 --max_retries 5 --retry_delay 30 --timeout 60
+        python download.py http://example.com/file.zip ./output/file.zip --unzip --track_extraction --chunk_size 1048576 --max_retries 5 --retry_delay 30 --timeout 60
 """
 
 import argparse
 import logging
 import os
 import sys
-import time
 import traceback
-from typing import Dict
-
-import requests
-from tqdm import tqdm
+from typing import Optional
 
 sys.path.append(os.getcwd())
 
 
 from utils.checksum import perform_checksum
-from utils.create_directory import create_directory
+from utils.downloader import (
+    DEFAULT_BACKOFF_CAP,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_IO_BUFFER_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PART_SIZE,
+    IO_BACKENDS,
+    MINIMUM_CHUNK_SIZE,
+    download_file_parallel,
+    download_file_with_retry,
+    set_socket_receive_buffer_size,
+)
 from utils.logger_config import setup_logger
-from utils.unzip_file import extract_zip_file_recursive
-
-MINIMUM_CHUNK_SIZE = 1024
-
-
-def download_file_with_retry(
-    logger: logging.Logger,
-    url: str,
-    destination: str,
-    chunk_size: int = MINIMUM_CHUNK_SIZE,
-    max_retries: int = int(1e6),
-    retry_delay: int = 60,
-    timeout: int = 60,
-) -> bool:
-    """
-    Download a file from a given URL with retry mechanism.
-
-    Args:
-        logger (logging.Logger): Logger object for logging.
-        url (str): The URL of the file to download.
-        destination (str): The path where the downloaded file will be saved.
-        chunk_size (int, optional): Size of each chunk to download in bytes. Default is 1024.
-        max_retries (int, optional): Maximum number of retry attempts upon failure. Default is 15.
-        retry_delay (int, optional): Delay between retry attempts in seconds. Default is 60.
-        timeout (int, optional): Maximum waiting time for server response in seconds. Default is 60.
-
-    Returns:
-        bool: True if the download is successful or already completed, False otherwise.
-    """
-    logger.info(
-        "Download file process initiated (url: '%s', destination: '%s')",
-        url,
-        destination,
-    )
-
-    retry_count: int = 0
-    resume_header: Dict[str, str] = {}
-    downloaded_bytes: int = 0  # Track downloaded bytes across retries
-
-    if os.path.exists(destination):
-        downloaded_bytes = os.path.getsize(destination)
-        resume_header["Range"] = f"bytes={downloaded_bytes}-"
-
-    create_directory(destination=destination, logger=logger)
-
-    while retry_count < max_retries:
-        try:
-            with requests.get(
-                url, stream=True, headers=resume_header, timeout=timeout
-            ) as response:
-                # Raise exception if status code is anything other than 200
-                response.raise_for_status()
-
-                file_size: int = int(response.headers.get("content-length", 0))
-
-                # Write to file in "append binary" mode ("ab")
-                with open(destination, "ab") as file, tqdm(
-                    total=file_size,
-                    initial=downloaded_bytes,  # Set initial value for progress bar
-                    unit="B",
-                    unit_scale=True,
-                    unit_divisor=1024,
-                    desc=os.path.basename(destination),
-                ) as progress_bar:
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            file.write(chunk)
-                            chunk_length: int = len(chunk)
-                            progress_bar.update(chunk_length)
-                            downloaded_bytes += chunk_length
-                        else:
-                            logger.warning("Empty chunk")
-
-            logger.info(
-                "Download file process successfully completed (url: '%s', destination: '%s')",
-                url,
-                os.path.abspath(destination),
-            )
-
-            return True
-
-        except requests.exceptions.HTTPError as http_e:
-            if response.status_code == 416:
-                logger.info(
-                    "(416 Range Not Satisfiable) The file has already been fully downloaded. (Error: %s)",
-                    http_e,
-                )
-
-                return True
-
-            else:
-                raise
-
-        except requests.exceptions.RequestException as e:
-            logger.error(
-                "An error occurred during the download file process: %s (url: '%s', destination: '%s')",
-                e,
-                url,
-                destination,
-            )
-
-            retry_count += 1
-            logger.warning(
-                "retry_count: %s, max_retries: %s.", retry_count, max_retries
-            )
-
-            if retry_count < max_retries:
-                logger.warning("Retrying download in %s seconds...", retry_delay)
-                time.sleep(retry_delay)
-
-            # Calculate resume_header for the next retry attempt
-            if os.path.exists(destination):
-                downloaded_bytes = os.path.getsize(destination)
-                resume_header["Range"] = f"bytes={downloaded_bytes}-"
-
-    logger.warning("Max retries (%s) reached. Download terminated.", max_retries)
-
-    return False
+from utils.unzip_file import MAX_PROCESSES, extract_zip_file_recursive
 
 
 def main():
@@ -159,20 +50,32 @@ def main():
         parser.add_argument(
             "--chunk_size",
             type=int,
-            default=8192,
+            default=DEFAULT_CHUNK_SIZE,
             help="Size of each download chunk in bytes",
         )
+        parser.add_argument(
+            "--io_buffer_size",
+            type=int,
+            default=DEFAULT_IO_BUFFER_SIZE,
+            help="Buffer size of the destination file in bytes (-1 for system default)",
+        )
         parser.add_argument(
             "--max_retries",
             type=int,
-            default=int(1e6),
-            help="Maximum number of retry attempts upon failure",
+            default=None,
+            help="Maximum number of retry attempts upon failure (unbounded by default)",
         )
         parser.add_argument(
             "--retry_delay",
             type=int,
             default=10,
-            help="Delay between retry attempts in seconds",
+            help="Base delay between retry attempts in seconds (exponential backoff with jitter)",
+        )
+        parser.add_argument(
+            "--backoff_cap",
+            type=int,
+            default=DEFAULT_BACKOFF_CAP,
+            help="Upper bound of the retry backoff in seconds",
         )
         parser.add_argument(
             "--timeout",
@@ -180,6 +83,31 @@ def main():
             default=60,
             help="Maximum waiting time for server response in seconds",
         )
+        parser.add_argument(
+            "--socket_rcvbuf",
+            type=int,
+            default=0,
+            help="Socket receive buffer size (SO_RCVBUF) in bytes, e.g. 4194304 for high-latency links (0 keeps the OS default)",
+        )
+        parser.add_argument(
+            "--io_backend",
+            type=str,
+            choices=IO_BACKENDS,
+            default="sync",
+            help="Write downloaded chunks on the download thread (sync) or on a background thread (threaded)",
+        )
+        parser.add_argument(
+            "--max_concurrency",
+            type=int,
+            default=DEFAULT_MAX_CONCURRENCY,
+            help="Number of byte ranges downloaded concurrently (1 disables parallel download)",
+        )
+        parser.add_argument(
+            "--part_size",
+            type=int,
+            default=DEFAULT_PART_SIZE,
+            help="Size of each concurrently downloaded byte range in bytes",
+        )
         parser.add_argument(
             "--yaml_config_path",
             type=str,
@@ -208,6 +136,12 @@ def main():
             default=1,
             help="Maximum number of recursions before raising an error.",
         )
+        parser.add_argument(
+            "--unzip_workers",
+            type=int,
+            default=1,
+            help=f"Number of processes extracting the zip file entries, at most {MAX_PROCESSES} (1 extracts them on threads)",
+        )
         parser.add_argument(
             "--debug_logging",
             action="store_true",
@@ -224,8 +158,9 @@ def main():
             raise ValueError(
                 f"The download chunk size provided is too small. Received {chunk_size}, minimum is {MINIMUM_CHUNK_SIZE}"
             )
-        max_retries: int = args.max_retries
-        if max_retries < 0:
+        io_buffer_size: int = args.io_buffer_size
+        max_retries: Optional[int] = args.max_retries
+        if max_retries is not None and max_retries < 0:
             raise ValueError(
                 f"The maximum number of download retries cannot be negative. Received {max_retries}"
             )
@@ -234,16 +169,42 @@ def main():
             raise ValueError(
                 f"The retry delay cannot be negative. Received {retry_delay}"
             )
+        backoff_cap: int = args.backoff_cap
+        if backoff_cap < 0:
+            raise ValueError(
+                f"The retry backoff cap cannot be negative. Received {backoff_cap}"
+            )
         timeout: int = args.timeout
         if timeout < 0:
             raise ValueError(
                 f"The request timeout cannot be negative. Received {timeout}"
             )
+        socket_rcvbuf: int = args.socket_rcvbuf
+        if socket_rcvbuf < 0:
+            raise ValueError(
+                f"The socket receive buffer size cannot be negative. Received {socket_rcvbuf}"
+            )
+        io_backend: str = args.io_backend
+        max_concurrency: int = args.max_concurrency
+        if max_concurrency < 1:
+            raise ValueError(
+                f"The maximum download concurrency must be at least 1. Received {max_concurrency}"
+            )
+        part_size: int = args.part_size
+        if part_size < MINIMUM_CHUNK_SIZE:
+            raise ValueError(
+                f"The download part size provided is too small. Received {part_size}, minimum is {MINIMUM_CHUNK_SIZE}"
+            )
         yaml_config_path = args.yaml_config_path
         unzip: bool = args.unzip
         unzip_destination: str = args.unzip_destination
         track_extraction: bool = args.track_extraction
         max_recursion_depth: int = args.max_recursion_depth
+        unzip_workers: int = args.unzip_workers
+        if unzip_workers < 1:
+            raise ValueError(
+                f"The number of extraction processes must be at least 1. Received {unzip_workers}"
+            )
         debug_logging: bool = args.debug_logging
 
         pointer_file_url: str = url.replace("resolve", "raw").split("?")[0]
@@ -257,20 +218,48 @@ def main():
             logger.handlers
         ), f"Log configuration failed to assign handlers (config: {yaml_config_path})"
 
-        download_succeeded: bool = download_file_with_retry(
-            logger=logger,
-            url=url,
-            destination=destination,
-            chunk_size=chunk_size,
-            max_retries=max_retries,
-            retry_delay=retry_delay,
-            timeout=timeout,
-        )
+        if socket_rcvbuf:
+            set_socket_receive_buffer_size(socket_rcvbuf)
+
+        if max_concurrency > 1:
+            download_succeeded, file_hash = download_file_parallel(
+                logger=logger,
+                url=url,
+                destination=destination,
+                chunk_size=chunk_size,
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                timeout=timeout,
+                io_buffer_size=io_buffer_size,
+                backoff_cap=backoff_cap,
+                io_backend=io_backend,
+                max_concurrency=max_concurrency,
+                part_size=part_size,
+                hash_name="sha256",
+            )
+
+        else:
+            download_succeeded, file_hash = download_file_with_retry(
+                logger=logger,
+                url=url,
+                destination=destination,
+                chunk_size=chunk_size,
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                timeout=timeout,
+                io_buffer_size=io_buffer_size,
+                backoff_cap=backoff_cap,
+                io_backend=io_backend,
+                hash_name="sha256",
+            )
 
         if download_succeeded:
             logger.info("Checksum process initiated for file: '%s'", destination)
             if perform_checksum(
-                file_path=destination, pointer_file_url=pointer_file_url, logger=logger
+                file_path=destination,
+                pointer_file_url=pointer_file_url,
+                logger=logger,
+                file_hash=file_hash,
             ):
                 logger.info(
                     "Checksum process successfully completed for file: '%s'",
@@ -294,6 +283,7 @@ def main():
                     max_recursion_depth=max_recursion_depth,
                     logger=logger,
                     debug_logging=debug_logging,
+                    processes=unzip_workers,
                 )
 
     except KeyboardInterrupt:
@@ -0,0 +1,331 @@
+"""
+Tests for the downloader of `utils/downloader.py` against a local HTTP server.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import http.server
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+import pytest
+
+# Ensure the tests know the parent package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from async_download import download_many
+from utils.downloader import (
+    download_file_parallel,
+    download_file_with_retry,
+    parse_retry_after,
+)
+
+FILE_CONTENT = b"Cap3D rendered image " * (10 * 1024 * 1024 // 21)
+
+# Not periodic, so bytes written at a wrong offset change the digest
+RANGE_FILE_CONTENT = random.Random(0).randbytes(3 * 1024 * 1024 + 123)
+
+
+class _GzipRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves `FILE_CONTENT` gzip encoded if the client accepts it (or always if `always_encode` is set).
+    """
+
+    always_encode = False
+
+    def do_GET(self) -> None:
+        body = FILE_CONTENT
+        if self.always_encode or "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _AlwaysGzipRequestHandler(_GzipRequestHandler):
+    always_encode = True
+
+
+class _RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves `RANGE_FILE_CONTENT`, honouring single byte ranges if `supports_range` is set.
+
+    The first `failures` GET requests are answered with 503 and a `Retry-After` of `retry_after` seconds. The
+    `Range` header of every GET request is recorded in `ranges` (None if absent).
+    """
+
+    supports_range = True
+    failures = 0
+    retry_after = "0"
+    ranges: list = []
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        if self.supports_range:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(RANGE_FILE_CONTENT)))
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        range_header = self.headers.get("Range")
+        self.ranges.append(range_header)
+
+        if type(self).failures > 0:
+            type(self).failures -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", self.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+            return
+
+        body = RANGE_FILE_CONTENT
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if self.supports_range and match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(body) - 1
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+                return
+
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{end}/{len(RANGE_FILE_CONTENT)}"
+            )
+            body = body[start : end + 1]
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _serve(handler_class: type):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(params=[_GzipRequestHandler, _AlwaysGzipRequestHandler])
+def server_url(request):
+    yield from _serve(request.param)
+
+
+@pytest.fixture
+def range_handler():
+    # A fresh subclass per test, so the tests can configure it and inspect its requests independently
+    class Handler(_RangeRequestHandler):
+        ranges: list = []
+
+    return Handler
+
+
+@pytest.fixture
+def range_server_url(range_handler):
+    yield from _serve(range_handler)
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_download_gzip_encoded_body(server_url, tmp_path):
+    destination = str(tmp_path / "file.bin")
+
+    succeeded, file_hash = download_file_with_retry(
+        logger=logging.getLogger(__name__),
+        url=server_url,
+        destination=destination,
+        max_retries=1,
+        retry_delay=0,
+        hash_name="sha256",
+    )
+
+    expected_hash = hashlib.sha256(FILE_CONTENT).hexdigest()
+    assert succeeded
+    assert os.path.getsize(destination) == len(FILE_CONTENT)
+    assert file_hash == expected_hash
+    with open(destination, "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == expected_hash
+
+
+def test_download_many_gzip_encoded_body(server_url, tmp_path):
+    destination = str(tmp_path / "file.bin")
+
+    results = asyncio.run(
+        download_many(
+            urls=[server_url],
+            destinations=[destination],
+            logger=logging.getLogger(__name__),
+            max_retries=1,
+            retry_delay=0,
+            checksum=False,
+        )
+    )
+
+    assert results == [True]
+    with open(destination, "rb") as f:
+        assert f.read() == FILE_CONTENT
+
+
+def test_parallel_download_fetches_ranges(range_handler, range_server_url, tmp_path):
+    destination = str(tmp_path / "file.bin")
+
+    succeeded, file_hash = download_file_parallel(
+        logger=logging.getLogger(__name__),
+        url=range_server_url,
+        destination=destination,
+        chunk_size=64 * 1024,
+        max_retries=1,
+        retry_delay=0,
+        max_concurrency=4,
+        part_size=1024 * 1024,
+        hash_name="sha256",
+    )
+
+    assert succeeded
+    assert _read(destination) == RANGE_FILE_CONTENT
+    assert file_hash == hashlib.sha256(RANGE_FILE_CONTENT).hexdigest()
+    assert len(range_handler.ranges) == 4  # One request per part
+    assert all(range_header is not None for range_header in range_handler.ranges)
+
+
+def test_parallel_download_falls_back_without_range_support(
+    range_handler, range_server_url, tmp_path
+):
+    range_handler.supports_range = False
+    destination = str(tmp_path / "file.bin")
+
+    succeeded, file_hash = download_file_parallel(
+        logger=logging.getLogger(__name__),
+        url=range_server_url,
+        destination=destination,
+        max_retries=1,
+        retry_delay=0,
+        max_concurrency=4,
+        part_size=1024 * 1024,
+        hash_name="sha256",
+    )
+
+    assert succeeded
+    assert _read(destination) == RANGE_FILE_CONTENT
+    assert file_hash == hashlib.sha256(RANGE_FILE_CONTENT).hexdigest()
+    assert range_handler.ranges == [None]  # A single stream
+
+
+def test_resume_hashes_bytes_already_on_disk(range_handler, range_server_url, tmp_path):
+    destination = tmp_path / "file.bin"
+    destination.write_bytes(RANGE_FILE_CONTENT[:1000])
+
+    succeeded, file_hash = download_file_with_retry(
+        logger=logging.getLogger(__name__),
+        url=range_server_url,
+        destination=str(destination),
+        max_retries=1,
+        retry_delay=0,
+        hash_name="sha256",
+    )
+
+    assert succeeded
+    assert range_handler.ranges == ["bytes=1000-"]
+    assert destination.read_bytes() == RANGE_FILE_CONTENT
+    assert file_hash == hashlib.sha256(RANGE_FILE_CONTENT).hexdigest()
+
+
+def test_download_restarts_if_range_is_ignored(
+    range_handler, range_server_url, tmp_path
+):
+    range_handler.supports_range = False
+    destination = tmp_path / "file.bin"
+    destination.write_bytes(b"stale partial download")
+
+    succeeded, file_hash = download_file_with_retry(
+        logger=logging.getLogger(__name__),
+        url=range_server_url,
+        destination=str(destination),
+        max_retries=1,
+        retry_delay=0,
+        hash_name="sha256",
+    )
+
+    assert succeeded
+    assert range_handler.ranges == [f"bytes={len(b'stale partial download')}-"]
+    assert destination.read_bytes() == RANGE_FILE_CONTENT
+    assert file_hash == hashlib.sha256(RANGE_FILE_CONTENT).hexdigest()
+
+
+def test_async_download_restarts_if_range_is_ignored(
+    range_handler, range_server_url, tmp_path
+):
+    range_handler.supports_range = False
+    destination = tmp_path / "file.bin"
+    destination.write_bytes(b"stale partial download")
+
+    results = asyncio.run(
+        download_many(
+            urls=[range_server_url],
+            destinations=[str(destination)],
+            logger=logging.getLogger(__name__),
+            max_retries=1,
+            retry_delay=0,
+            checksum=False,
+        )
+    )
+
+    assert results == [True]
+    assert destination.read_bytes() == RANGE_FILE_CONTENT
+
+
+def test_retry_waits_for_retry_after(range_handler, range_server_url, tmp_path):
+    range_handler.failures = 1
+    range_handler.retry_after = "1"
+    destination = str(tmp_path / "file.bin")
+
+    start = time.monotonic()
+    succeeded, _ = download_file_with_retry(
+        logger=logging.getLogger(__name__),
+        url=range_server_url,
+        destination=destination,
+        max_retries=2,
+        retry_delay=0,
+    )
+
+    assert succeeded
+    assert time.monotonic() - start >= 1.0
+    assert len(range_handler.ranges) == 2
+    assert _read(destination) == RANGE_FILE_CONTENT
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "120"}) == 120.0
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
+    assert parse_retry_after(None) is None
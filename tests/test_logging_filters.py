@@ -0,0 +1,61 @@
+"""
+Tests for the logging filter of `utils/handlers/logging_filters.py`.
+"""
+
+import logging
+import os
+import sys
+
+# Ensure the tests know the parent package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.handlers.logging_filters import LRUDedupFilter
+
+
+def _record(
+    message: str, *args, created: float = 0.0, level: int = logging.INFO, lineno=1
+):
+    record = logging.LogRecord(
+        "test", level, "/path/module.py", lineno, message, args, None
+    )
+    record.created = created
+
+    return record
+
+
+def test_repeated_records_are_dropped_within_window():
+    dedup_filter = LRUDedupFilter(window=1.0)
+
+    assert dedup_filter.filter(_record("Retrying %s", "a", created=10.0))
+    assert not dedup_filter.filter(_record("Retrying %s", "a", created=10.5))
+    assert dedup_filter.filter(_record("Retrying %s", "a", created=11.2))
+
+
+def test_records_with_different_arguments_are_kept():
+    dedup_filter = LRUDedupFilter()
+
+    assert dedup_filter.filter(_record("Checksum of %s: %s", "a", "ok"))
+    assert dedup_filter.filter(_record("Checksum of %s: %s", "b", "ok"))
+    assert dedup_filter.filter(_record("Checksum of %s: %s", "a", "ok", lineno=2))
+    assert not dedup_filter.filter(_record("Checksum of %s: %s", "a", "ok"))
+
+
+def test_warnings_are_never_dropped():
+    dedup_filter = LRUDedupFilter()
+
+    for level in (logging.WARNING, logging.ERROR):
+        assert dedup_filter.filter(_record("Failed", level=level))
+        assert dedup_filter.filter(_record("Failed", level=level))
+
+
+def test_least_recently_used_message_is_forgotten():
+    dedup_filter = LRUDedupFilter(capacity=2)
+
+    assert dedup_filter.filter(_record("a"))
+    assert dedup_filter.filter(_record("b"))
+    assert dedup_filter.filter(_record("c"))
+
+    # "a" was evicted by "c", while "b" and "c" are still remembered
+    assert dedup_filter.filter(_record("a"))
+    assert not dedup_filter.filter(_record("c"))
+    assert len(dedup_filter._last_logged) == 2
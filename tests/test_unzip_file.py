@@ -0,0 +1,201 @@
+"""
+Tests for the zip file extraction of `utils/unzip_file.py` on zip files built in a temporary directory.
+"""
+
+import io
+import logging
+import os
+import random
+import sys
+import zipfile
+from typing import Dict, List
+
+import pytest
+
+# Ensure the tests know the parent package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import utils.unzip_file as unzip_file
+from utils.unzip_file import _get_target_path, extract_zip_file_recursive
+
+# Not periodic, so bytes copied from a wrong offset are detected
+STORED_CONTENT = random.Random(0).randbytes(3 * 1024 * 1024 + 7)
+
+
+def _zip_bytes(entries: Dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as zip_file:
+        for name, data in entries.items():
+            zip_file.writestr(name, data)
+
+    return buffer.getvalue()
+
+
+def _write_zip(path, entries: Dict[str, bytes], **kwargs) -> str:
+    path.write_bytes(_zip_bytes(entries, **kwargs))
+
+    return str(path)
+
+
+def _files(directory) -> Dict[str, bytes]:
+    return {
+        os.path.relpath(os.path.join(root, name), directory): open(
+            os.path.join(root, name), "rb"
+        ).read()
+        for root, _, names in os.walk(directory)
+        for name in names
+    }
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger(f"{__name__}.extraction")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = _RecordingHandler()
+    logger.handlers = [handler]
+
+    yield logger
+
+    logger.handlers = []
+
+
+@pytest.fixture
+def nested_zip(tmp_path):
+    inner = _zip_bytes({"inner/a.txt": b"a", "inner/b.txt": b"b" * 1000})
+    return _write_zip(
+        tmp_path / "outer.zip",
+        {"dir/inner.zip": inner, "top.txt": b"top", "empty/": b""},
+    )
+
+
+NESTED_ZIP_FILES = {
+    os.path.join("dir", "inner", "inner", "a.txt"): b"a",
+    os.path.join("dir", "inner", "inner", "b.txt"): b"b" * 1000,
+    "top.txt": b"top",
+}
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "../evil.txt",
+        "/abs/evil.txt",
+        "a/../../evil.txt",
+        "./a/./evil.txt",
+        "a//evil.txt",
+    ],
+)
+def test_target_path_stays_in_extraction_directory(name, tmp_path):
+    extract_to = str(tmp_path / "out")
+
+    target_path = _get_target_path(zipfile.ZipInfo(name), extract_to)
+
+    assert os.path.commonpath([target_path, extract_to]) == extract_to
+    assert ".." not in target_path.split(os.path.sep)
+    assert target_path.endswith("evil.txt")
+
+
+def test_extraction_rejects_zip_slip(tmp_path, logger):
+    zip_path = _write_zip(
+        tmp_path / "slip.zip",
+        {"../evil.txt": b"evil", "/abs.txt": b"abs", "ok/../../up.txt": b"up"},
+    )
+    extract_to = tmp_path / "deep" / "out"
+
+    extract_zip_file_recursive(zip_path, str(extract_to), -1, logger=logger)
+
+    assert _files(extract_to) == {
+        "evil.txt": b"evil",
+        "abs.txt": b"abs",
+        # Like zipfile, ".." components are dropped rather than resolved
+        os.path.join("ok", "up.txt"): b"up",
+    }
+    assert sorted(os.listdir(tmp_path / "deep")) == ["out"]
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_stored_entries_are_copied(parallel, tmp_path, logger):
+    zip_path = _write_zip(
+        tmp_path / "stored.zip",
+        {"images/a.bin": STORED_CONTENT, "images/b.bin": b"", "c.txt": b"c"},
+        compression=zipfile.ZIP_STORED,
+    )
+
+    extract_zip_file_recursive(
+        zip_path, str(tmp_path / "out"), -1, logger=logger, parallel=parallel
+    )
+
+    assert _files(tmp_path / "out") == {
+        os.path.join("images", "a.bin"): STORED_CONTENT,
+        os.path.join("images", "b.bin"): b"",
+        "c.txt": b"c",
+    }
+
+
+def test_corrupt_stored_entry_raises(tmp_path, logger):
+    data = bytearray(_zip_bytes({"a.bin": STORED_CONTENT}, zipfile.ZIP_STORED))
+    data[data.index(STORED_CONTENT[:64]) + 1000] ^= 0xFF
+    zip_path = tmp_path / "corrupt.zip"
+    zip_path.write_bytes(data)
+
+    with pytest.raises(zipfile.BadZipFile, match="Bad CRC-32"):
+        extract_zip_file_recursive(
+            str(zip_path), str(tmp_path / "out"), -1, logger=logger, parallel=False
+        )
+
+
+@pytest.mark.parametrize("budget", [unzip_file.NESTED_ZIP_MEMORY_BUDGET, 0])
+def test_nested_zip_is_extracted(budget, nested_zip, tmp_path, logger, monkeypatch):
+    # Without a budget, nested zip files take the on-disk path
+    monkeypatch.setattr(unzip_file, "NESTED_ZIP_MEMORY_BUDGET", budget)
+
+    extract_zip_file_recursive(nested_zip, str(tmp_path / "out"), -1, logger=logger)
+
+    assert _files(tmp_path / "out") == NESTED_ZIP_FILES
+    assert os.path.isdir(tmp_path / "out" / "empty")
+    assert unzip_file._nested_zip_memory_used == 0
+
+
+def test_nested_zip_is_kept_at_depth_limit(tmp_path, logger):
+    deep = _zip_bytes({"deep.txt": b"deep"})
+    zip_path = _write_zip(
+        tmp_path / "outer.zip",
+        {"inner.zip": _zip_bytes({"deep.zip": deep, "inner.txt": b"inner"})},
+    )
+
+    extract_zip_file_recursive(
+        zip_path, str(tmp_path / "out"), -1, max_recursion_depth=0, logger=logger
+    )
+
+    # The zip file beyond the limit is neither extracted nor lost
+    files = _files(tmp_path / "out")
+    assert files[os.path.join("inner", "deep.zip")] == deep
+    assert os.path.join("inner", "deep", "deep.txt") not in files
+    assert unzip_file._nested_zip_memory_used == 0
+
+
+def test_process_pool_extraction(nested_zip, tmp_path, logger):
+    extract_zip_file_recursive(
+        nested_zip, str(tmp_path / "out"), -1, logger=logger, processes=2
+    )
+
+    assert _files(tmp_path / "out") == NESTED_ZIP_FILES
+    assert os.path.isdir(tmp_path / "out" / "empty")
+
+    # The records of the processes reach the logger of this process
+    messages = logger.handlers[0].messages
+    assert any(
+        "Unzipping file process started" in message
+        and os.path.join("dir", "inner.zip") in message
+        for message in messages
+    )
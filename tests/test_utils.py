@@ -0,0 +1,81 @@
+"""
+Tests for the YAML configuration loading of `utils/utils.py`.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Ensure the tests know the parent package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import utils.utils as utils_module
+from utils.utils import load_yaml_config
+
+
+@pytest.fixture
+def cache_directory(tmp_path, monkeypatch):
+    cache_directory = tmp_path / "cache"
+    monkeypatch.setattr(utils_module, "YAML_JSON_CACHE_DIRECTORY", str(cache_directory))
+    utils_module._yaml_cache.clear()
+
+    yield cache_directory
+
+    utils_module._yaml_cache.clear()
+
+
+def _write_config(path, content: str, mtime_ns: int) -> str:
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    return str(path)
+
+
+def test_config_is_served_from_memory(cache_directory, tmp_path, monkeypatch):
+    config_path = _write_config(tmp_path / "config.yaml", "a: 1\nb: [1, 2]\n", 10**18)
+
+    config = load_yaml_config(config_path)
+    assert config == {"a": 1, "b": [1, 2]}
+
+    def fail(*args):
+        raise AssertionError("The configuration was loaded again")
+
+    monkeypatch.setattr(utils_module, "_load_yaml_file", fail)
+
+    # Modifying the returned copy leaves the cached configuration unchanged
+    config["b"].append(3)
+    assert load_yaml_config(config_path) == {"a": 1, "b": [1, 2]}
+
+
+def test_config_is_cached_as_json(cache_directory, tmp_path):
+    config_path = _write_config(tmp_path / "config.yaml", "a: 1\n", 10**18)
+
+    assert load_yaml_config(config_path) == {"a": 1}
+    assert len(os.listdir(cache_directory)) == 1
+
+    # A fresh process reuses the JSON file rather than parsing the YAML file
+    utils_module._yaml_cache.clear()
+    (cache_file,) = cache_directory.iterdir()
+    cache_file.write_text(
+        cache_file.read_text(encoding="utf-8").replace('"a": 1', '"a": 2'),
+        encoding="utf-8",
+    )
+    assert load_yaml_config(config_path) == {"a": 2}
+
+
+def test_modified_config_replaces_cache_file(cache_directory, tmp_path):
+    config_path = _write_config(tmp_path / "config.yaml", "a: 1\n", 10**18)
+    assert load_yaml_config(config_path) == {"a": 1}
+
+    _write_config(tmp_path / "config.yaml", "a: 2\n", 10**18 + 1)
+    assert load_yaml_config(config_path) == {"a": 2}
+
+    utils_module._yaml_cache.clear()
+    assert load_yaml_config(config_path) == {"a": 2}
+    assert len(os.listdir(cache_directory)) == 1
+
+
+def test_missing_config_raises(cache_directory, tmp_path):
+    with pytest.raises(FileNotFoundError, match="not found"):
+        load_yaml_config(str(tmp_path / "missing.yaml"))
@@ -17,28 +17,83 @@ Functions:
 - extract_sha256_from_pointer_file(bytes_data: bytes) -> Optional[str]:
     Extracts the SHA-256 hash from a pointer file given as a byte stream.
 
-- calculate_file_hash(file_path: str, logger: logging.Logger) -> str:
-    Calculates the SHA-256 hash of a file at the specified path.
+- calculate_file_hash(
+    file_path: str,
+    logger: logging.Logger,
+    algorithm: str = "sha256",
+    use_cache: bool = False,
+) -> str:
+    Calculates the SHA-256 (or another hashlib or BLAKE3) hash of a file at the specified path, optionally reusing
+    the hash stored in a sidecar file if the file has not changed since.
+
+- fetch_expected_hash(pointer_file_url: str, session: Optional[requests.Session] = None) -> Optional[str]:
+    Requests a pointer file and extracts its SHA-256 hash. Extracted hashes are cached per URL.
 
 - perform_checksum(
     file_path: str,
     pointer_file_url: str,
     logger: Optional[logging.Logger] = None,
+    file_hash: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    use_cache: bool = False,
 ) -> bool:
     Performs a checksum verification of a file against a pointer file. Returns True if the checksum matches, False otherwise.
 
+- perform_checksums(
+    items: Iterable[Tuple[str, str]],
+    logger: Optional[logging.Logger] = None,
+    max_workers: int = DEFAULT_CHECKSUM_WORKERS,
+    use_cache: bool = False,
+) -> List[bool]:
+    Performs checksum verifications of many files against their pointer files concurrently.
+
 - main():
     Command-line interface for performing checksum operations. Parses command-line arguments and initiates checksum verification.
 """
 
 import argparse
+import concurrent.futures
+import functools
 import hashlib
 import logging
+import mmap
+import os
+import re
+import ssl
 import sys
+import threading
+import time
 import traceback
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from utils.logger_config import get_default_logger
+
+try:
+    import blake3  # Optional, only needed for BLAKE3 hashes
+except ImportError:
+    blake3 = None  # type: ignore[assignment]
+
+# Fits in L2 cache, large enough to amortize the read syscalls (used before Python 3.11)
+HASH_BUFFER_SIZE = 128 * 1024
+# Files larger than this are hashed through a memory map
+MMAP_THRESHOLD = 64 * 1024 * 1024
+# SHA256 throughput (bytes/second) below which the hash is assumed not to be hardware accelerated
+MINIMUM_SHA256_THROUGHPUT = 500 * 1000 * 1000
+
+POINTER_FILE_CACHE_SIZE = 4096
+POINTER_FILE_TIMEOUT = 10  # seconds
+DEFAULT_CHECKSUM_WORKERS = 16
+# Connections kept alive per host, enough for concurrent checksums
+POINTER_FILE_POOL_SIZE = 32
+
+# "oid sha256:<hash>" line of a Git LFS pointer file
+POINTER_FILE_SHA256_PATTERN = re.compile(
+    rb"^oid sha256:([0-9a-f]{64})\s*$", re.MULTILINE | re.IGNORECASE
+)
 
 
 def sha256_hash(data: bytes) -> str:
@@ -51,67 +106,311 @@ def sha256_hash(data: bytes) -> str:
     Returns:
         str: The hexadecimal representation of the SHA-256 hash.
     """
-    sha256: hashlib.sha256 = hashlib.sha256()
+    sha256 = hashlib.sha256()
     sha256.update(data)
 
     return sha256.hexdigest()
 
 
-def extract_sha256_from_pointer_file(bytes_data: bytes) -> str or None:
+def extract_sha256_from_pointer_file(bytes_data: bytes) -> Optional[str]:
     """
     Extract the SHA256 hash from a bytes string.
 
+    The bytes are searched directly, without decoding them or splitting them into lines.
+
     Args:
         bytes_data (bytes): The bytes string containing the data.
 
     Returns:
-        str or None: The extracted SHA256 hash if found, otherwise None.
+        Optional[str]: The extracted SHA256 hash (lowercase hexadecimal) if found, otherwise None.
     """
-    # Decode bytes to string
-    data_str: str = bytes_data.decode("utf-8")
-
-    # Split the string into lines
-    lines: List[str] = data_str.split("\n")
-
-    # Find the line containing the SHA256 hash
-    sha256_line: str or None = next(
-        (line for line in lines if line.lower().startswith("oid sha256:")), None
-    )
+    match = POINTER_FILE_SHA256_PATTERN.search(bytes_data)
+    if match:
+        return match.group(1).decode("ascii").lower()
 
-    # Extract the SHA256 hash value
-    if sha256_line:
-        return sha256_line.split("sha256:")[1]
+    return None
 
 
-def calculate_file_hash(file_path: str, logger: logging.Logger) -> str:
+def calculate_file_hash(
+    file_path: str,
+    logger: logging.Logger,
+    algorithm: str = "sha256",
+    use_cache: bool = False,
+) -> str:
     """
     Calculate the SHA256 hash of a file.
 
     Args:
         file_path (str): The path to the file.
         logger (logging.Logger): Logger instance for logging.
+        algorithm (str, optional): Name of a hashlib algorithm, or "blake3" for a multithreaded BLAKE3 hash
+            (requires the `blake3` package). BLAKE3 is much faster but only suits local integrity checks, pointer
+            files contain SHA256 hashes. Default is "sha256".
+        use_cache (bool, optional): Whether to store the hash in a sidecar file ("<file_path>.<algorithm>") and
+            return it without reading the file while the file's size and modification time are unchanged.
+            Default is False.
 
     Returns:
-        str: The hexadecimal representation of the SHA256 hash.
+        str: The hexadecimal representation of the hash.
+
+    Raises:
+        ImportError: If `algorithm` is "blake3" and the `blake3` package is not installed.
     """
-    logger.debug(f"Reading file bytes for checksum (file_path: {file_path})")
+    if use_cache:
+        stat_result: os.stat_result = os.stat(file_path)
+        cache_path = f"{file_path}.{algorithm}"
+
+        cached_hash: Optional[str] = _read_cached_hash(cache_path, stat_result)
+        if cached_hash is not None:
+            logger.debug("Using cached file hash (checksum) from '%s'", cache_path)
+
+            return cached_hash
+
+        file_hash = calculate_file_hash(
+            file_path=file_path, logger=logger, algorithm=algorithm
+        )
+
+        # Keyed by the metadata from before hashing, so a file modified meanwhile does not match
+        _write_cached_hash(cache_path, stat_result, file_hash, logger)
+
+        return file_hash
+
+    logger.debug(
+        "Calculating file hash (checksum) (file_path: %s, algorithm: %s)",
+        file_path,
+        algorithm,
+    )
+
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ImportError(
+                "BLAKE3 hashes require the blake3 package (pip install blake3)"
+            )
+
+        # Memory maps the file and hashes it on all cores
+        blake3_hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        blake3_hasher.update_mmap(file_path)
+
+        logger.debug("Successfully calculated file hash (checksum)")
+
+        return blake3_hasher.hexdigest()
+
+    if algorithm == "sha256":
+        _check_sha256_throughput(logger)
+
+    hasher = hashlib.new(algorithm)
+
+    with open(file_path, "rb", buffering=0) as file:
+        if os.fstat(file.fileno()).st_size > MMAP_THRESHOLD:
+            try:
+                # Hash straight from the page cache without copying into a user space buffer
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)  # Aggressive readahead
+
+                    hasher.update(mm)
 
-    # Read the file's bytes
-    with open(file_path, "rb") as file:
-        file_bytes: bytes = file.read()
+                logger.debug("Successfully calculated file hash (checksum)")
 
-    logger.debug("Calculating file hash (checksum) from file bytes")
+                return hasher.hexdigest()
 
-    # Calculate the SHA256 hash of the file's bytes
-    file_hash: str = sha256_hash(file_bytes)
+            except (OSError, ValueError) as e:
+                # Not mappable (e.g. special files), fall back to reading
+                logger.debug("Memory mapping failed, reading file instead: %s", e)
 
-    logger.debug("Successfully calculated file hash (checksum) from file bytes")
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            hasher = hashlib.file_digest(file, algorithm)
+
+        else:
+            # Stream the file through a reused buffer instead of reading it into memory at once.
+            # Unbuffered I/O as the buffer already batches the reads.
+            buffer = bytearray(HASH_BUFFER_SIZE)
+            view = memoryview(buffer)
+            while bytes_read := file.readinto(buffer):
+                hasher.update(view[:bytes_read])
+
+    logger.debug("Successfully calculated file hash (checksum)")
+
+    return hasher.hexdigest()
+
+
+def _read_cached_hash(cache_path: str, stat_result: os.stat_result) -> Optional[str]:
+    """
+    Read a hash from a sidecar file if it was stored for a file of the given size and modification time.
+
+    Args:
+        cache_path (str): Path of the sidecar file.
+        stat_result (os.stat_result): Current metadata of the hashed file.
+
+    Returns:
+        Optional[str]: The cached hash, or None if there is no (valid) sidecar file for the current file.
+    """
+    try:
+        with open(cache_path, "r", encoding="ascii") as cache_file:
+            size, mtime_ns, file_hash = cache_file.read().split()
+
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
+
+    if int(size) != stat_result.st_size or int(mtime_ns) != stat_result.st_mtime_ns:
+        return None
 
     return file_hash
 
 
+def _write_cached_hash(
+    cache_path: str,
+    stat_result: os.stat_result,
+    file_hash: str,
+    logger: logging.Logger,
+) -> None:
+    """
+    Atomically write a hash to a sidecar file, together with the size and modification time of the hashed file.
+
+    Caching is best effort: if the sidecar file cannot be written (e.g. read-only or full directory), the failure
+    is logged at debug level and the hash is simply not cached.
+
+    Args:
+        cache_path (str): Path of the sidecar file.
+        stat_result (os.stat_result): Metadata of the hashed file when it was hashed.
+        file_hash (str): The hash to store.
+        logger (logging.Logger): Logger instance for logging.
+    """
+    # Unique per process and thread, so concurrent writers never interleave on the same temporary file
+    temporary_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary_path, "w", encoding="ascii") as cache_file:
+            cache_file.write(
+                f"{stat_result.st_size} {stat_result.st_mtime_ns} {file_hash}\n"
+            )
+
+        os.replace(temporary_path, cache_path)
+
+    except OSError as e:
+        logger.debug("Could not cache the file hash in '%s': %s", cache_path, e)
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass  # Never created
+
+
+# Whether the SHA256 throughput was measured in this process, whichever logger the measurement was reported to
+_sha256_throughput_checked = False
+_sha256_throughput_lock = threading.Lock()
+
+
+def _check_sha256_throughput(logger: logging.Logger) -> None:
+    """
+    Measure the SHA256 throughput once per process and warn if it looks unaccelerated.
+
+    hashlib uses the EVP interface of the linked OpenSSL, which picks SHA-NI/ARMv8 SHA instructions when the CPU
+    has them. Without them SHA256 is about three times slower, which usually means an outdated OpenSSL. Calls after
+    the first return immediately.
+
+    Args:
+        logger (logging.Logger): Logger instance the measurement is reported to (only used by the first call).
+    """
+    global _sha256_throughput_checked
+
+    with _sha256_throughput_lock:
+        if _sha256_throughput_checked:
+            return
+
+        _sha256_throughput_checked = True
+
+    data = bytes(16 * 1024 * 1024)
+    start = time.perf_counter()
+    hashlib.sha256(data)
+    throughput = len(data) / max(time.perf_counter() - start, 1e-9)
+
+    logger.debug("SHA256 throughput: %.0f MB/s", throughput / 1e6)
+    if throughput < MINIMUM_SHA256_THROUGHPUT:
+        logger.warning(
+            "SHA256 hashing is slow (%.0f MB/s), hardware SHA extensions do not seem to be used by %s. "
+            "Upgrading OpenSSL may speed up checksums considerably.",
+            throughput / 1e6,
+            ssl.OPENSSL_VERSION,
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_session() -> requests.Session:
+    """
+    Get the session shared by pointer file requests, so connections to the server are kept alive and reused.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(pool_maxsize=POINTER_FILE_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+# Expected hashes by pointer file URL, only successfully extracted hashes are cached
+_expected_hash_cache: "OrderedDict[str, str]" = OrderedDict()
+_expected_hash_cache_lock = threading.Lock()
+
+
+def fetch_expected_hash(
+    pointer_file_url: str, session: Optional[requests.Session] = None
+) -> Optional[str]:
+    """
+    Request a pointer file and extract the expected SHA256 hash from it.
+
+    Extracted hashes are cached per URL (regardless of the session), so repeated checksums against the same pointer
+    file do not request it again. Failed requests raise and pointer files without a hash return None, neither is
+    cached, so a transient failure does not affect later checksums.
+
+    Args:
+        pointer_file_url (str): The URL of the pointer file.
+        session (Optional[requests.Session]): Session to request the pointer file with. If not provided, a shared
+            session is used.
+
+    Returns:
+        Optional[str]: The expected SHA256 hash if found in the pointer file, otherwise None.
+
+    Raises:
+        requests.exceptions.HTTPError: If the pointer file request fails.
+    """
+    with _expected_hash_cache_lock:
+        expected_hash = _expected_hash_cache.get(pointer_file_url)
+        if expected_hash is not None:
+            _expected_hash_cache.move_to_end(pointer_file_url)
+
+            return expected_hash
+
+    if session is None:
+        session = _get_session()
+
+    response: requests.Response = session.get(
+        pointer_file_url, timeout=POINTER_FILE_TIMEOUT
+    )
+    response.raise_for_status()
+
+    expected_hash = extract_sha256_from_pointer_file(bytes_data=response.content)
+    if expected_hash is not None:
+        with _expected_hash_cache_lock:
+            _expected_hash_cache[pointer_file_url] = expected_hash
+            _expected_hash_cache.move_to_end(pointer_file_url)
+            if len(_expected_hash_cache) > POINTER_FILE_CACHE_SIZE:
+                _expected_hash_cache.popitem(
+                    last=False
+                )  # Evict the least recently used URL
+
+    return expected_hash
+
+
 def perform_checksum(
-    file_path: str, pointer_file_url: str, logger: Optional[logging.Logger] = None
+    file_path: str,
+    pointer_file_url: str,
+    logger: Optional[logging.Logger] = None,
+    file_hash: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    use_cache: bool = False,
 ) -> bool:
     """
     Perform checksum verification of a file against a pointer file.
@@ -120,46 +419,89 @@ def perform_checksum(
         file_path (str): The path to the file.
         pointer_file_url (str): The URL of the pointer file.
         logger (Optional[logging.Logger]): Logger instance for logging. If not provided, a new one will be created.
+        file_hash (Optional[str]): SHA-256 hash of the file if already known (e.g. computed while downloading).
+            If not provided, it is calculated from the file.
+        session (Optional[requests.Session]): Session to request the pointer file with. If not provided, a shared
+            session is used.
+        use_cache (bool, optional): Whether to reuse the hash stored in a sidecar file if the file has not changed
+            since it was hashed (see `calculate_file_hash`). Default is False.
 
     Returns:
         bool: True if the file's checksum matches the expected checksum from the pointer file, False otherwise.
     """
     if not logger or not logger.hasHandlers():
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.StreamHandler(),
-            ],
+        logger = get_default_logger(__name__, level=logging.DEBUG)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        # Request the pointer file in the background while the file is hashed
+        logger.info("Requesting pointer file from url: '%s'", pointer_file_url)
+        expected_hash_future: concurrent.futures.Future = executor.submit(
+            fetch_expected_hash, pointer_file_url, session
         )
 
-        logger = logging.getLogger()  # Get the root logger
+        if file_hash is None:
+            logger.info("Calculate file hash process started for file: '%s'", file_path)
+            file_hash = calculate_file_hash(
+                file_path=file_path, logger=logger, use_cache=use_cache
+            )
+            logger.info(
+                "Calculate file hash process successfully completed for file: '%s' (file hash: '%s')",
+                file_path,
+                file_hash,
+            )
+
+        else:
+            logger.info(
+                "Using precomputed file hash for file: '%s' (file hash: '%s')",
+                file_path,
+                file_hash,
+            )
+
+        expected_hash: Optional[str] = expected_hash_future.result()
 
-    logger.info("Calculate file hash process started for file: '%s'", file_path)
-    file_hash: str = calculate_file_hash(file_path=file_path, logger=logger)
     logger.info(
-        "Calculate file hash process successfully completed for file: '%s' (file hash: '%s')",
-        file_path,
-        file_hash,
+        "Received expected file hash from pointer file url: '%s' (pointer file hash: '%s')",
+        pointer_file_url,
+        expected_hash,
     )
 
-    logger.info("Requesting pointer file from url: '%s'", pointer_file_url)
-    response: requests.Response = requests.get(pointer_file_url, timeout=10)
-    response.raise_for_status()
-    logger.info("Received pointer file from url: '%s'", pointer_file_url)
+    return file_hash == expected_hash
 
-    pointer_file: bytes = response.content
 
-    logger.info("Extracting expected file hash from pointer file process started")
-    expected_hash: str or None = extract_sha256_from_pointer_file(
-        bytes_data=pointer_file
-    )
-    logger.info(
-        "Extracting expected file hash from pointer file process successfully completed (pointer file hash: '%s')",
-        expected_hash,
-    )
+def perform_checksums(
+    items: Iterable[Tuple[str, str]],
+    logger: Optional[logging.Logger] = None,
+    max_workers: int = DEFAULT_CHECKSUM_WORKERS,
+    use_cache: bool = False,
+) -> List[bool]:
+    """
+    Perform checksum verifications of many files against their pointer files concurrently.
 
-    return file_hash == expected_hash
+    Files are verified on a thread pool, so disk reads, hashing (hashlib releases the GIL) and pointer file
+    requests of different files overlap.
+
+    Args:
+        items (Iterable[Tuple[str, str]]): Pairs of file path and pointer file URL.
+        logger (Optional[logging.Logger]): Logger instance for logging. If not provided, a new one will be created.
+        max_workers (int, optional): Maximum number of files verified concurrently. Default is 16.
+        use_cache (bool, optional): Whether to reuse hashes stored in sidecar files (see `calculate_file_hash`).
+            Default is False.
+
+    Returns:
+        List[bool]: Whether each file's checksum matches the expected checksum, in the order of `items`.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda item: perform_checksum(
+                    file_path=item[0],
+                    pointer_file_url=item[1],
+                    logger=logger,
+                    use_cache=use_cache,
+                ),
+                items,
+            )
+        )
 
 
 def main():
@@ -169,6 +511,11 @@ def main():
         parser.add_argument(
             "pointer_file_url", type=str, help="URL of pointer file for downloaded file"
         )
+        parser.add_argument(
+            "--use_cache",
+            action="store_true",
+            help="Store the file hash in a sidecar file and reuse it while the file is unchanged.",
+        )
 
         args: argparse.Namespace = parser.parse_args()
         print(f"args: {args}")
@@ -195,6 +542,7 @@ def main():
             file_path=file_path,
             pointer_file_url=pointer_file_url,
             logger=logger,
+            use_cache=args.use_cache,
         )
 
         logger.info("checksum succeeded: %s", checksum_succeeded)
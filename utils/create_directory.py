@@ -13,7 +13,12 @@ Example:
 import argparse
 import logging
 import os
-from typing import Optional
+from typing import Optional, Set
+
+from utils.logger_config import get_default_logger
+
+# Directories known to exist, so repeated calls for the same directory skip the filesystem
+_created_directories: Set[str] = set()
 
 
 def create_directory(
@@ -36,39 +41,37 @@ def create_directory(
     """
     directory_created = False
 
+    absolute_path = os.path.abspath(destination)
+    directory = absolute_path if is_directory else os.path.dirname(absolute_path)
+    if directory in _created_directories:
+        return directory_created
+
     if not logger or not logger.hasHandlers():
-        logging.basicConfig(
-            level=logging.DEBUG if debug_logging else logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.StreamHandler(),
-            ],
+        logger = get_default_logger(
+            __name__, level=logging.DEBUG if debug_logging else logging.INFO
         )
 
-        logger = logging.getLogger()  # Get the root logger
+    log = logger.debug if debug_logging else logger.info
 
     try:
-        absolute_path = os.path.abspath(destination)
-        logger.log(
-            logging.DEBUG if debug_logging else logging.INFO,
+        log(
             "Creating directory for %s process started with: '%s'",
             "directory" if is_directory else "file",
             absolute_path,
         )
 
-        directory = absolute_path if is_directory else os.path.dirname(absolute_path)
-
-        if not os.path.exists(directory):
-            logger.debug("Creating directory: %s", directory)
+        # Attempt the creation directly instead of checking for existence first (one syscall less, no race)
+        try:
             os.makedirs(directory)
             logger.debug("Created directory: %s", directory)
             directory_created = True
 
-        else:
+        except FileExistsError:
             logger.debug("Directory already exists: %s", directory)
 
-        logger.log(
-            logging.DEBUG if debug_logging else logging.INFO,
+        _created_directories.add(directory)
+
+        log(
             "Creating directory for %s process successfuly completed with file: '%s'",
             "directory" if is_directory else "file",
             absolute_path,
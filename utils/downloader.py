@@ -0,0 +1,890 @@
+"""
+Module for downloading files with a retry mechanism.
+
+This module provides functionality for downloading a file over a single connection, resuming partially downloaded
+files and retrying with exponential backoff, and for downloading byte ranges of a file concurrently over multiple
+connections. Connections are pooled in a shared `requests.Session` so they are reused across retries and downloads.
+
+Example:
+    >>> import logging
+    >>> from utils.downloader import download_file_parallel
+    >>> logger = logging.getLogger(__name__)
+    >>> download_file_parallel(logger, 'http://example.com/file.zip', 'download/file.zip')
+
+Functions:
+- download_file_with_retry(logger: logging.Logger, url: str, destination: str, ...) -> bool:
+    Downloads a file over a single connection, resuming from any partially downloaded file.
+
+- download_file_parallel(logger: logging.Logger, url: str, destination: str, ...) -> bool:
+    Downloads byte ranges of a file concurrently, falling back to `download_file_with_retry`.
+
+- set_socket_receive_buffer_size(size: int) -> None:
+    Sets the receive buffer size (SO_RCVBUF) of the sockets used by subsequent downloads.
+
+- get_retry_delay(retry_count: int, retry_delay: float, backoff_cap: float, ...) -> float:
+    Computes the delay before the next retry using exponential backoff with full jitter.
+
+- parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    Parses the `Retry-After` header of a response (of `requests` or `aiohttp`).
+"""
+
+import concurrent.futures
+import contextlib
+import email.utils
+import functools
+import hashlib
+import itertools
+import logging
+import os
+import queue
+import random
+import shutil
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+from tqdm.utils import CallbackIOWrapper
+from urllib3.connection import HTTPConnection
+
+from utils.create_directory import create_directory
+
+MINIMUM_CHUNK_SIZE = 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_IO_BUFFER_SIZE = 4 * 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 8
+SESSION_POOL_SIZE = 16
+DEFAULT_BACKOFF_CAP = 600
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IO_BACKENDS = ("sync", "threaded")
+WRITE_QUEUE_DEPTH = 32
+PROGRESS_UPDATE_BYTES = 4 * 1024 * 1024
+PROGRESS_UPDATE_INTERVAL = 0.25  # seconds
+HASH_READ_SIZE = 1024 * 1024
+
+# Seeded from the OS so that concurrent processes draw decorrelated retry delays
+_random = random.SystemRandom()
+
+
+class SocketOptionsAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter that sets the given socket options on every connection it opens.
+
+    Args:
+        socket_options (List[Tuple[int, int, int]]): (level, option, value) tuples passed to `socket.setsockopt`.
+        **kwargs: Keyword arguments forwarded to `HTTPAdapter`.
+    """
+
+    def __init__(self, socket_options: List[Tuple[int, int, int]], **kwargs):
+        # Must be set before HTTPAdapter.__init__ calls init_poolmanager
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Socket options of new connections (urllib3's defaults already enable TCP_NODELAY)
+_socket_options: List[Tuple[int, int, int]] = list(
+    HTTPConnection.default_socket_options
+)
+
+
+def _mount_adapters(session: requests.Session) -> None:
+    """
+    Mount pooled adapters applying the current socket options on a session.
+
+    Args:
+        session (requests.Session): The session to mount the adapters on.
+    """
+    for prefix in ("https://", "http://"):
+        session.mount(
+            prefix,
+            SocketOptionsAdapter(
+                socket_options=_socket_options,
+                pool_connections=SESSION_POOL_SIZE,
+                pool_maxsize=SESSION_POOL_SIZE,
+            ),
+        )
+
+
+def set_socket_receive_buffer_size(size: int) -> None:
+    """
+    Set the receive buffer size (SO_RCVBUF) of the sockets used by subsequent downloads.
+
+    Note that on Linux an explicit SO_RCVBUF disables receive buffer autotuning, so only set this when the
+    default window limits throughput (high bandwidth-delay product links).
+
+    Args:
+        size (int): Receive buffer size in bytes.
+    """
+    _socket_options[:] = list(HTTPConnection.default_socket_options) + [
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    ]
+    _mount_adapters(_get_session())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_session() -> requests.Session:
+    """
+    Get the session shared by all downloads, creating it on first use.
+
+    Reusing one session keeps TCP/TLS connections alive across retries and across downloads.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    session = _create_session()
+    session.headers["Connection"] = "keep-alive"
+
+    return session
+
+
+def _create_session() -> requests.Session:
+    """
+    Create a session for downloads.
+
+    The session requests bodies without a content encoding (`Accept-Encoding: identity`): the body is copied to
+    disk undecoded, so the bytes on disk, the `Range` offsets and the checksum all refer to the file itself.
+
+    Returns:
+        requests.Session: The new session.
+    """
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "identity"
+    _mount_adapters(session)
+
+    return session
+
+
+# One requests.Session per worker thread for parallel range downloads
+_thread_local = threading.local()
+
+
+def download_file_with_retry(
+    logger: logging.Logger,
+    url: str,
+    destination: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_retries: Optional[int] = None,
+    retry_delay: int = 60,
+    timeout: int = 60,
+    io_buffer_size: int = DEFAULT_IO_BUFFER_SIZE,
+    backoff_cap: int = DEFAULT_BACKOFF_CAP,
+    io_backend: str = "sync",
+    hash_name: Optional[str] = None,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Download a file from a given URL with retry mechanism.
+
+    Args:
+        logger (logging.Logger): Logger object for logging.
+        url (str): The URL of the file to download.
+        destination (str): The path where the downloaded file will be saved.
+        chunk_size (int, optional): Size of each chunk to download in bytes. Default is 1 MiB.
+            Small chunks multiply the per-chunk loop, write and progress bar overhead.
+        max_retries (Optional[int]): Maximum number of retry attempts upon failure. Default is None (unbounded).
+        retry_delay (int, optional): Base delay between retry attempts in seconds, doubled after every
+            failed attempt and randomly jittered. Default is 60.
+        timeout (int, optional): Maximum waiting time for server response in seconds. Default is 60.
+        io_buffer_size (int, optional): Buffer size in bytes of the destination file. Default is 4 MiB.
+        backoff_cap (int, optional): Upper bound of the retry backoff in seconds. Default is 600.
+        io_backend (str, optional): "sync" to write to disk on the download thread, or "threaded" to hand
+            writes to a background thread so receiving data overlaps with disk writes. Default is "sync".
+        hash_name (Optional[str]): Name of a hashlib algorithm (e.g. "sha256") used to hash the file while it is
+            downloaded, so it does not need to be read again for a checksum. Default is None (no hashing).
+
+    Returns:
+        Tuple[bool, Optional[str]]: True if the download is successful or already completed, False otherwise,
+            and the hexadecimal digest of the downloaded file if `hash_name` was given and the download succeeded.
+    """
+    logger.info(
+        "Download file process initiated (url: '%s', destination: '%s')",
+        url,
+        destination,
+    )
+
+    resume_header: Dict[str, str] = {}
+    file_name: str = os.path.basename(destination)
+
+    # Downloaded bytes are tracked in memory across retries, the file is only stat'ed once
+    downloaded_bytes: int = (
+        os.path.getsize(destination) if os.path.exists(destination) else 0
+    )
+
+    create_directory(destination=destination, logger=logger)
+
+    file_hasher: Optional[FileHasher] = (
+        FileHasher(hash_name, destination) if hash_name else None
+    )
+
+    for retry_count in _attempts(max_retries):
+        if downloaded_bytes:
+            resume_header["Range"] = f"bytes={downloaded_bytes}-"
+        else:
+            resume_header.pop("Range", None)
+
+        try:
+            with _get_session().get(
+                url, stream=True, headers=resume_header, timeout=timeout
+            ) as response:
+                # Raise exception if status code is anything other than 200
+                response.raise_for_status()
+
+                file_size: int = int(response.headers.get("content-length", 0))
+
+                if downloaded_bytes and response.status_code == 200:
+                    # The server ignored the Range header and is sending the whole file
+                    logger.warning(
+                        "Server does not support resuming, restarting download from the beginning (destination: '%s')",
+                        destination,
+                    )
+                    downloaded_bytes = 0
+
+                if file_hasher is not None:
+                    # Hash the bytes already on disk that the hash does not cover yet
+                    file_hasher.sync(downloaded_bytes)
+
+                # Copy the body straight into the file, updating the progress bar per write.
+                # Socket-to-file sendfile/splice is not an option: TLS is decrypted in user space and
+                # urllib3 buffers (and de-chunks) the body, so the bytes must pass through Python.
+                # Only unencoded bodies are requested, but decode the body if a server encodes it anyway.
+                content_encoding: str = response.headers.get(
+                    "content-encoding", "identity"
+                )
+                response.raw.decode_content = content_encoding != "identity"
+                if response.raw.decode_content:
+                    logger.warning(
+                        "Server sent a '%s' encoded body, decoding it (destination: '%s')",
+                        content_encoding,
+                        destination,
+                    )
+                    file_size = 0  # The content length is the size of the encoded body
+
+                # Write after the bytes already downloaded ("r+b"), or to a new file ("wb")
+                with open(
+                    destination,
+                    "r+b" if downloaded_bytes else "wb",
+                    buffering=io_buffer_size,
+                ) as file, tqdm(
+                    total=downloaded_bytes + file_size,
+                    initial=downloaded_bytes,  # Set initial value for progress bar
+                    unit="B",
+                    unit_scale=True,
+                    unit_divisor=1024,
+                    desc=file_name,
+                    mininterval=PROGRESS_UPDATE_INTERVAL,
+                    maxinterval=1.0,
+                ) as progress_bar:
+                    if file_size > 0:
+                        # Allocate the whole file up front for contiguous extents
+                        _preallocate(file.fileno(), downloaded_bytes + file_size)
+
+                    file.seek(downloaded_bytes)
+                    try:
+                        with (
+                            _ThreadedFileWriter(file)
+                            if io_backend == "threaded"
+                            else contextlib.nullcontext(file)
+                        ) as writer:
+                            if file_hasher is not None:
+                                writer = _HashingWriter(writer, file_hasher)
+
+                            shutil.copyfileobj(
+                                response.raw,
+                                CallbackIOWrapper(progress_bar.update, writer, "write"),
+                                length=chunk_size,
+                            )
+                    finally:
+                        # Drop preallocated space past the last written byte so the download can be resumed
+                        file.truncate()
+                        downloaded_bytes = file.tell()
+
+            logger.info(
+                "Download file process successfully completed (url: '%s', destination: '%s')",
+                url,
+                os.path.abspath(destination),
+            )
+
+            return True, file_hasher.hexdigest() if file_hasher else None
+
+        except requests.exceptions.HTTPError as http_e:
+            if response.status_code == 416:
+                logger.info(
+                    "(416 Range Not Satisfiable) The file has already been fully downloaded. (Error: %s)",
+                    http_e,
+                )
+
+                if file_hasher is not None:
+                    file_hasher.sync(downloaded_bytes)
+
+                return True, file_hasher.hexdigest() if file_hasher else None
+
+            elif response.status_code not in RETRYABLE_STATUS_CODES:
+                raise
+
+            error = http_e
+            retry_after = parse_retry_after(response.headers)
+
+        except (
+            requests.exceptions.RequestException,
+            urllib3.exceptions.HTTPError,
+        ) as e:
+            error = e
+            retry_after = None
+
+        logger.error(
+            "An error occurred during the download file process: %s (url: '%s', destination: '%s')",
+            error,
+            url,
+            destination,
+        )
+
+        logger.warning("retry_count: %s, max_retries: %s.", retry_count, max_retries)
+
+        if max_retries is None or retry_count < max_retries:
+            delay = get_retry_delay(retry_count, retry_delay, backoff_cap, retry_after)
+            logger.warning("Retrying download in %.1f seconds...", delay)
+            time.sleep(delay)
+
+    logger.warning("Max retries (%s) reached. Download terminated.", max_retries)
+
+    return False, None
+
+
+class FileHasher:
+    """
+    Incremental hash of the first `size` bytes of a file.
+
+    Bytes written to the file are fed to the hash with `update`. Before resuming a download, `sync` aligns the
+    hash with the bytes actually on disk, reading only the part of the file the hash does not cover yet.
+
+    Args:
+        hash_name (str): Name of the hashlib algorithm, e.g. "sha256".
+        file_path (str): Path of the file being hashed.
+    """
+
+    def __init__(self, hash_name: str, file_path: str):
+        self.hash_name = hash_name
+        self.file_path = file_path
+        self.hasher = hashlib.new(hash_name)
+        self.size = 0
+
+    def update(self, data: bytes) -> None:
+        self.hasher.update(data)
+        self.size += len(data)
+
+    def sync(self, size: int) -> None:
+        """
+        Make the hash cover exactly the first `size` bytes of the file.
+
+        Args:
+            size (int): Number of bytes of the file the hash should cover.
+        """
+        if size < self.size:
+            # Bytes were discarded (e.g. download restarted), hash from the beginning again
+            self.hasher = hashlib.new(self.hash_name)
+            self.size = 0
+
+        if size > self.size:
+            with open(self.file_path, "rb") as file:
+                file.seek(self.size)
+                while self.size < size:
+                    data = file.read(min(HASH_READ_SIZE, size - self.size))
+                    if not data:
+                        raise EOFError(
+                            f"File '{self.file_path}' is shorter than {size} bytes"
+                        )
+
+                    self.update(data)
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+
+class _HashingWriter:
+    """
+    File-like wrapper that feeds every chunk written to a file to a `FileHasher`.
+
+    Args:
+        file (BinaryIO): File (or file-like writer) to write to.
+        file_hasher (FileHasher): Hash to update with the written chunks.
+    """
+
+    def __init__(self, file: BinaryIO, file_hasher: FileHasher):
+        self.file = file
+        self.file_hasher = file_hasher
+
+    def write(self, data: bytes) -> int:
+        written = self.file.write(data)
+        self.file_hasher.update(data)
+
+        return written
+
+
+class _ThreadedFileWriter:
+    """
+    File-like wrapper that performs writes on a background thread.
+
+    Writes are queued (up to `queue_depth` pending chunks) and return immediately, so the caller can keep
+    reading from the network while the previous chunks are written to disk. A write error is raised on the
+    next call to `write` or when the context manager exits.
+
+    Args:
+        file (BinaryIO): File to write to.
+        queue_depth (int, optional): Maximum number of chunks waiting to be written. Defaults to 32.
+    """
+
+    def __init__(self, file: BinaryIO, queue_depth: int = WRITE_QUEUE_DEPTH):
+        self.file = file
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while (data := self.queue.get()) is not None:
+            if self.error is None:
+                try:
+                    self.file.write(data)
+                except BaseException as e:
+                    self.error = e
+
+    def write(self, data: bytes) -> int:
+        if self.error is not None:
+            raise self.error
+
+        self.queue.put(data)
+
+        return len(data)
+
+    def __enter__(self) -> "_ThreadedFileWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # Wait for all queued chunks to be written
+        self.queue.put(None)
+        self.thread.join()
+
+        if self.error is not None and exc_info[0] is None:
+            raise self.error
+
+
+def _attempts(max_retries: Optional[int]) -> Iterable[int]:
+    """
+    Number the download attempts, starting at 1.
+
+    Args:
+        max_retries (Optional[int]): Maximum number of attempts, or None for unbounded.
+
+    Returns:
+        Iterable[int]: The attempt numbers 1, 2, ... up to `max_retries` (endless if None).
+    """
+    if max_retries is None:
+        return itertools.count(1)
+
+    return range(1, max_retries + 1)
+
+
+def get_retry_delay(
+    retry_count: int,
+    retry_delay: float,
+    backoff_cap: float,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Compute the delay before the next retry using exponential backoff with full jitter.
+
+    Args:
+        retry_count (int): Number of attempts that have failed so far (starting at 1).
+        retry_delay (float): Base delay in seconds, doubled after every failed attempt.
+        backoff_cap (float): Upper bound of the backoff in seconds.
+        retry_after (Optional[float]): Delay in seconds requested by the server via `Retry-After`, if any.
+
+    Returns:
+        float: Delay in seconds, drawn uniformly from [0, min(backoff_cap, retry_delay * 2 ** (retry_count - 1))]
+            and never shorter than `retry_after`.
+    """
+    # Bound the exponent so the backoff stays cheap to compute for very large retry counts
+    backoff = min(backoff_cap, retry_delay * 2 ** min(retry_count - 1, 32))
+    delay = _random.uniform(0, backoff)
+
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+
+    return delay
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Parse the `Retry-After` header of a response.
+
+    Args:
+        headers (Optional[Mapping[str, str]]): Case-insensitive headers of the response (of `requests` or `aiohttp`).
+
+    Returns:
+        Optional[float]: Delay in seconds requested by the server, or None if absent or invalid.
+    """
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _get_thread_session() -> requests.Session:
+    """
+    Get the requests.Session owned by the calling thread, creating it on first use.
+
+    Returns:
+        requests.Session: Session reused for every request made by the calling thread.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = _create_session()
+        _thread_local.session = session
+
+    return session
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """
+    Preallocate `size` bytes for the file referred to by `fd`.
+
+    Args:
+        fd (int): File descriptor of the file to preallocate.
+        size (int): Size of the file in bytes.
+    """
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        # posix_fallocate is unavailable (e.g. macOS) or unsupported by the file system
+        os.ftruncate(fd, size)
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    """
+    Write all of `data` to the file referred to by `fd` starting at `offset`.
+
+    Args:
+        fd (int): File descriptor of the file to write to.
+        data (bytes): Data to write.
+        offset (int): Offset in bytes from the start of the file.
+    """
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _download_part(
+    logger: logging.Logger,
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    chunk_size: int,
+    max_retries: Optional[int],
+    retry_delay: int,
+    timeout: int,
+    backoff_cap: int,
+    progress_bar: tqdm,
+    stop_event: threading.Event,
+) -> int:
+    """
+    Download the byte range [start, end] of a file and write it at the same offset of the destination.
+
+    Args:
+        logger (logging.Logger): Logger object for logging.
+        url (str): The URL of the file to download.
+        fd (int): File descriptor of the (preallocated) destination file.
+        start (int): First byte of the range.
+        end (int): Last byte of the range (inclusive).
+        chunk_size (int): Size of each chunk to download in bytes.
+        max_retries (Optional[int]): Maximum number of retry attempts upon failure, None for unbounded.
+        retry_delay (int): Delay between retry attempts in seconds.
+        timeout (int): Maximum waiting time for server response in seconds.
+        backoff_cap (int): Upper bound of the retry backoff in seconds.
+        progress_bar (tqdm): Progress bar shared between all parts.
+        stop_event (threading.Event): Event signalling the part download should be abandoned.
+
+    Returns:
+        int: Offset up to which the range has been written. Equal to end + 1 if the part completed.
+    """
+    offset = start
+
+    for retry_count in _attempts(max_retries):
+        if stop_event.is_set():
+            break
+
+        try:
+            with _get_thread_session().get(
+                url,
+                stream=True,
+                headers={"Range": f"bytes={offset}-{end}"},
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+
+                if response.status_code != 206:
+                    logger.warning(
+                        "Range request not honoured (status code: %s, range: %s-%s)",
+                        response.status_code,
+                        offset,
+                        end,
+                    )
+
+                    return offset
+
+                # The progress bar is shared by all workers, so update it in batches
+                pending_bytes: int = 0
+                last_update: float = time.monotonic()
+                try:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if stop_event.is_set():
+                            return offset
+
+                        # iter_content never yields empty chunks (urllib3 drops keep-alive
+                        # frames and empty reads end the stream), so no emptiness check is needed
+                        _pwrite_all(fd, chunk, offset)
+                        chunk_length: int = len(chunk)
+                        offset += chunk_length
+                        pending_bytes += chunk_length
+
+                        now = time.monotonic()
+                        if (
+                            pending_bytes >= PROGRESS_UPDATE_BYTES
+                            or now - last_update >= PROGRESS_UPDATE_INTERVAL
+                        ):
+                            progress_bar.update(pending_bytes)
+                            pending_bytes = 0
+                            last_update = now
+                finally:
+                    progress_bar.update(pending_bytes)
+
+            return offset
+
+        except requests.exceptions.HTTPError as http_e:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                logger.error(
+                    "An error occurred during the download part process: %s (range: %s-%s)",
+                    http_e,
+                    offset,
+                    end,
+                )
+
+                return offset
+
+            error = http_e
+            retry_after = parse_retry_after(response.headers)
+
+        except requests.exceptions.RequestException as e:
+            error = e
+            retry_after = None
+
+        logger.error(
+            "An error occurred during the download part process: %s (range: %s-%s, retry_count: %s, max_retries: %s)",
+            error,
+            offset,
+            end,
+            retry_count,
+            max_retries,
+        )
+
+        if max_retries is None or retry_count < max_retries:
+            stop_event.wait(
+                get_retry_delay(retry_count, retry_delay, backoff_cap, retry_after)
+            )
+
+    return offset
+
+
+def download_file_parallel(
+    logger: logging.Logger,
+    url: str,
+    destination: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_retries: Optional[int] = None,
+    retry_delay: int = 60,
+    timeout: int = 60,
+    io_buffer_size: int = DEFAULT_IO_BUFFER_SIZE,
+    backoff_cap: int = DEFAULT_BACKOFF_CAP,
+    io_backend: str = "sync",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    part_size: int = DEFAULT_PART_SIZE,
+    hash_name: Optional[str] = None,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Download a file from a given URL by fetching byte ranges concurrently over multiple connections.
+
+    The server is probed with a HEAD request and the file is split into parts of `part_size` bytes which are
+    downloaded by a pool of `max_concurrency` threads and written at their offset in the preallocated destination.
+    Falls back to `download_file_with_retry` if the destination already exists, the server does not support
+    range requests or any part could not be downloaded. In the latter case the destination is first truncated
+    to its fully downloaded prefix so the single-stream download resumes from there.
+
+    Args:
+        logger (logging.Logger): Logger object for logging.
+        url (str): The URL of the file to download.
+        destination (str): The path where the downloaded file will be saved.
+        chunk_size (int, optional): Size of each chunk to download in bytes. Default is 1 MiB.
+        max_retries (Optional[int]): Maximum number of retry attempts upon failure (per part). Default is None
+            (unbounded).
+        retry_delay (int, optional): Base delay between retry attempts in seconds. Default is 60.
+        timeout (int, optional): Maximum waiting time for server response in seconds. Default is 60.
+        io_buffer_size (int, optional): Buffer size in bytes of the destination file (single-stream fallback only).
+        backoff_cap (int, optional): Upper bound of the retry backoff in seconds. Default is 600.
+        io_backend (str, optional): Write backend of the single-stream fallback ("sync" or "threaded").
+        max_concurrency (int, optional): Number of parts downloaded concurrently. Default is 8.
+        part_size (int, optional): Size of each part in bytes. Default is 16 MiB.
+        hash_name (Optional[str]): Name of a hashlib algorithm (e.g. "sha256") used to hash the downloaded file.
+            Parts complete out of order, so the file is hashed once all parts are written. Default is None.
+
+    Returns:
+        Tuple[bool, Optional[str]]: True if the download is successful or already completed, False otherwise,
+            and the hexadecimal digest of the downloaded file if `hash_name` was given and the download succeeded.
+    """
+
+    def fallback() -> Tuple[bool, Optional[str]]:
+        return download_file_with_retry(
+            logger=logger,
+            url=url,
+            destination=destination,
+            chunk_size=chunk_size,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            timeout=timeout,
+            io_buffer_size=io_buffer_size,
+            backoff_cap=backoff_cap,
+            io_backend=io_backend,
+            hash_name=hash_name,
+        )
+
+    if not hasattr(os, "pwrite") or os.path.exists(destination):
+        return fallback()
+
+    logger.info(
+        "Parallel download file process initiated (url: '%s', destination: '%s')",
+        url,
+        destination,
+    )
+
+    try:
+        head_response = _get_session().head(url, allow_redirects=True, timeout=timeout)
+        head_response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.warning("Range probe failed, falling back to single stream: %s", e)
+
+        return fallback()
+
+    file_size: int = int(head_response.headers.get("content-length", 0))
+    if head_response.headers.get("accept-ranges") != "bytes" or file_size <= 0:
+        logger.info(
+            "Server does not support range requests, falling back to single stream"
+        )
+
+        return fallback()
+
+    create_directory(destination=destination, logger=logger)
+
+    parts: List[Tuple[int, int]] = [
+        (start, min(start + part_size, file_size) - 1)
+        for start in range(0, file_size, part_size)
+    ]
+    offsets: List[int] = [start for start, _ in parts]
+    stop_event = threading.Event()
+
+    fd = os.open(destination, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        _preallocate(fd, file_size)
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency
+        ) as executor, tqdm(
+            total=file_size,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            desc=os.path.basename(destination),
+            mininterval=PROGRESS_UPDATE_INTERVAL,
+            maxinterval=1.0,
+        ) as progress_bar:
+            futures = {
+                executor.submit(
+                    _download_part,
+                    logger,
+                    url,
+                    fd,
+                    start,
+                    end,
+                    chunk_size,
+                    max_retries,
+                    retry_delay,
+                    timeout,
+                    backoff_cap,
+                    progress_bar,
+                    stop_event,
+                ): index
+                for index, (start, end) in enumerate(parts)
+            }
+
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    offsets[futures[future]] = future.result()
+            finally:
+                stop_event.set()
+
+    finally:
+        # Keep only the fully downloaded prefix so an interrupted download can be resumed
+        downloaded_bytes = file_size
+        for (start, end), offset in zip(parts, offsets):
+            if offset <= end:
+                downloaded_bytes = offset
+                break
+
+        if downloaded_bytes < file_size:
+            os.ftruncate(fd, downloaded_bytes)
+
+        os.close(fd)
+
+    if downloaded_bytes < file_size:
+        logger.warning(
+            "Parallel download incomplete (%s of %s bytes), resuming with single stream",
+            downloaded_bytes,
+            file_size,
+        )
+
+        return fallback()
+
+    logger.info(
+        "Parallel download file process successfully completed (url: '%s', destination: '%s')",
+        url,
+        os.path.abspath(destination),
+    )
+
+    if hash_name is None:
+        return True, None
+
+    # The file was just written, so it is read back from the page cache
+    file_hasher = FileHasher(hash_name, destination)
+    file_hasher.sync(file_size)
+
+    return True, file_hasher.hexdigest()
@@ -0,0 +1,78 @@
+"""
+Custom logging filter module.
+
+This module provides a filter for the Python logging framework that drops
+repeated log records, e.g. the same record logged again and again in a retry
+loop, so they do not flood the log file.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+
+class LRUDedupFilter(logging.Filter):
+    """
+    A filter that drops records repeating a recently logged message.
+
+    Records are keyed by the source location of their logging call, their level and their
+    message with its arguments merged in (as a `QueueHandler` does before handing records to
+    the handlers). Records of the same call site with different arguments, e.g. the result of
+    each checksum, are therefore all kept. A record is dropped if a record with the same key
+    passed the filter less than `window` seconds before it, so each message is logged at most
+    once per window. The keys are kept in a least recently used cache of `capacity` entries.
+    Records above `max_level` (by default warnings and errors) are never dropped.
+
+    Args:
+        capacity (int, optional): The number of messages remembered. Defaults to 1024.
+        window (float, optional): The time in seconds in which repeated records are dropped. Defaults to 1.0.
+        max_level (int, optional): The highest level of records that may be dropped. Defaults to logging.INFO.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        window: float = 1.0,
+        max_level: int = logging.INFO,
+    ):
+        super().__init__()
+        self.capacity = capacity
+        self.window = window
+        self.max_level = max_level
+
+        self._last_logged: "OrderedDict[Tuple[str, int, int, str], float]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Determines if the record is logged.
+
+        The creation time of the record is used rather than the current time, so records
+        filtered after being buffered are judged by when they were logged.
+
+        Args:
+            record (logging.LogRecord): The log record to filter.
+
+        Returns:
+            bool: False if the record repeats a message logged within the window, True otherwise.
+        """
+        if record.levelno > self.max_level:
+            return True
+
+        # Merging the arguments is cheap for queued records, whose arguments are already merged
+        key = (record.pathname, record.lineno, record.levelno, record.getMessage())
+        with self._lock:
+            last_logged = self._last_logged.get(key)
+            if last_logged is not None and record.created - last_logged < self.window:
+                return False
+
+            self._last_logged[key] = record.created
+            self._last_logged.move_to_end(key)
+            if len(self._last_logged) > self.capacity:
+                # Forget the least recently used message
+                self._last_logged.popitem(last=False)
+
+        return True
@@ -3,21 +3,30 @@ Custom logging handler module.
 
 This module provides a custom file handler for the Python logging framework.
 It allows logging to files with a timestamped name and can automatically
-create the necessary directories if they do not exist.
+create the necessary directories if they do not exist. It also provides a
+memory handler that batches records in front of such a file handler.
 """
 
 import logging
+import logging.handlers
 import os
+import threading
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
+
+# Timestamp of the log file names, formatted once per process
+_START_TIMESTAMP = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+
+# Log directories already created by this process
+_created_log_directories: Set[str] = set()
 
 
 class CustomFileHandler(logging.FileHandler):
     """
     A custom file handler that logs to a file with a timestamped name.
 
-    This handler creates a new log file with a name based on the current date
-    and time. It also ensures that the specified directory exists, creating
+    This handler creates a new log file with a name based on the date and time
+    the process started. It also ensures that the specified directory exists, creating
     it if necessary.
 
     Args:
@@ -39,12 +48,14 @@ class CustomFileHandler(logging.FileHandler):
         self.encoding = encoding
         self.delay = delay
 
-        # Generate the file_name based on the current time
-        now = datetime.now()
-        file_name = f"{self.log_directory}-{now:%Y-%m-%dT%H:%M:%S}.log"
+        # Generate the file_name based on the process start time
+        file_name = f"{self.log_directory}-{_START_TIMESTAMP}.log"
 
         # Create the logs directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        directory = os.path.dirname(file_name)
+        if directory and directory not in _created_log_directories:
+            os.makedirs(directory, exist_ok=True)
+            _created_log_directories.add(directory)
 
         # Initialize the FileHandler
         super().__init__(file_name, mode=mode, encoding=encoding, delay=delay)
@@ -71,6 +82,85 @@ class CustomFileHandler(logging.FileHandler):
         super().close()
 
 
+class FlushingMemoryHandler(logging.handlers.MemoryHandler):
+    """
+    A memory handler that also flushes periodically and writes each flushed batch at once.
+
+    Records are buffered until the buffer is full, a record of `flushLevel` or higher
+    arrives, or `flush_interval` seconds have passed. If the target is a stream handler
+    (e.g. a file handler), the whole batch is formatted and written with a single write
+    and flush instead of one per record.
+
+    Args:
+        capacity (int): The number of records to buffer before flushing.
+        flushLevel (int, optional): The level of records that trigger an immediate flush. Defaults to logging.ERROR.
+        target (logging.Handler, optional): The handler the buffered records are flushed to. Defaults to None.
+        flush_interval (float, optional): The maximum time in seconds records stay buffered. Defaults to 1.0.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        flushLevel: int = logging.ERROR,
+        target: Optional[logging.Handler] = None,
+        flush_interval: float = 1.0,
+    ):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.flush_interval = flush_interval
+
+        self._stop_flushing = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_periodically, name="log-flush", daemon=True
+        )
+        self._flush_thread.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Flushes the buffered records to the target handler.
+
+        Records below the target's level or rejected by its filters are dropped, as
+        `Handler.handle` would do.
+        """
+        target = self.target
+        if not isinstance(target, logging.StreamHandler) or target.stream is None:
+            super().flush()
+            return
+
+        with self.lock:
+            records = [
+                record
+                for record in self.buffer
+                if record.levelno >= target.level and target.filter(record)
+            ]
+            self.buffer.clear()
+            if not records:
+                return
+
+            with target.lock:
+                try:
+                    target.stream.write(
+                        "".join(
+                            target.format(record) + target.terminator
+                            for record in records
+                        )
+                    )
+                    target.flush()
+
+                except Exception:
+                    target.handleError(records[-1])
+
+    def close(self) -> None:
+        """
+        Stops the periodic flush and closes the handler, flushing any buffered records.
+        """
+        self._stop_flushing.set()
+        super().close()
+
+
 class AzureMonitorHandler(logging.Handler):
     """
     A placeholder class for a logging handler that sends logs to Azure Monitor.
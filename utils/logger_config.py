@@ -3,7 +3,8 @@ Module for configuring a logger with specified log_output_file_path.
 
 This module provides a function `setup_logger` to set up a logger with the specified log_output_file_path.
 The logger is configured to log messages to both a file with a name based on the current date 
-and a stream (console).
+and a stream (console). Records are handed to these handlers through a queue, so the logging threads
+do not wait for console and file writes, and file writes are batched.
 
 Example:
     To configure a logger to log to a file named 'mylog-2024-04-01.log' in the current directory 
@@ -16,13 +17,30 @@ Example:
     >>> logger.info('This is a test log message')
 """
 
+import atexit
 import logging
 import logging.config
-from typing import Optional
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Optional, Tuple
 
+from utils.handlers.logging_handlers import FlushingMemoryHandler
 from utils.utils import load_yaml_config
 
 DOWNLOAD_LOGGER = "download"
+DEFAULT_LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOG_BUFFER_CAPACITY = 8192  # Records buffered in front of file handlers
+LOG_FLUSH_INTERVAL = 1.0  # Seconds records stay buffered at most
+
+_default_logger_lock = threading.Lock()
+
+# Listener writing the queued records of the download logger to its configured handlers
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+# Arguments (and YAML file version) the running listener was set up with
+_setup_key: Optional[Tuple[str, int, int, Optional[str]]] = None
 
 
 def setup_logger(
@@ -32,6 +50,9 @@ def setup_logger(
     """
     Set up a logger with a YAML configuration and an optional specified path to output log file.
 
+    Repeated calls with the same arguments, while the YAML file is unchanged and the logger is still running,
+    return the configured logger without applying the configuration again.
+
     Args:
         yaml_config_path (str): The path to the yaml config file.
         log_output_file_path (Optional[str]): The relative path to the output log file.
@@ -42,7 +63,19 @@ def setup_logger(
     Raises:
         ValueError: If logging to file configured but no output file specified or neither stream logging nor file logging is enabled.
     """
+    global _queue_listener, _setup_key
+
     try:
+        stat_result = os.stat(yaml_config_path)
+        setup_key = (
+            os.path.realpath(yaml_config_path),
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+            log_output_file_path,
+        )
+        if _queue_listener is not None and setup_key == _setup_key:
+            return logging.getLogger(DOWNLOAD_LOGGER)
+
         # Load logging configuration from the specified YAML file
         config = load_yaml_config(yaml_config_path)
 
@@ -73,10 +106,105 @@ def setup_logger(
                 "Logger setup must setup at least one of stream logging and file logging"
             )
 
+        # Flush the records queued for the handlers that are about to be replaced
+        stop_queue_listener()
+
         logging.config.dictConfig(config)
 
-        return logging.getLogger(DOWNLOAD_LOGGER)
+        # Move the configured handlers behind a queue, written to by a background thread
+        logger = logging.getLogger(DOWNLOAD_LOGGER)
+        handlers = logger.handlers[:]
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        # Batch file writes, errors are still written immediately
+        handlers = [
+            (
+                _buffer_handler(handler)
+                if isinstance(handler, logging.FileHandler)
+                else handler
+            )
+            for handler in handlers
+        ]
+
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _queue_listener.start()
+        _setup_key = setup_key
+
+        return logger
 
     except Exception as e:
         print(f"Error setting up logger. (Error: {e}.)")
         raise e
+
+
+def stop_queue_listener() -> None:
+    """
+    Stop the background thread writing the records of the logger set up by `setup_logger`.
+
+    Records queued so far are written before returning. Called automatically at interpreter exit.
+    """
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.flush()
+
+        _queue_listener = None
+
+
+atexit.register(stop_queue_listener)
+
+
+def _buffer_handler(handler: logging.Handler) -> FlushingMemoryHandler:
+    """
+    Put a memory handler in front of a handler, so records are written to it in batches.
+
+    Args:
+        handler (logging.Handler): The handler to buffer records for.
+
+    Returns:
+        FlushingMemoryHandler: The memory handler wrapping `handler`.
+    """
+    buffering_handler = FlushingMemoryHandler(
+        LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=handler,
+        flush_interval=LOG_FLUSH_INTERVAL,
+    )
+    buffering_handler.setLevel(handler.level)  # Do not buffer records the handler drops
+
+    return buffering_handler
+
+
+def get_default_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+    """
+    Get a console logger for functions called without a configured logger.
+
+    The logger is configured with a stream handler the first time it is requested and returned as is afterwards,
+    so the fallback costs a dictionary lookup instead of a `logging.basicConfig` call per function call.
+
+    Args:
+        name (str): Name of the logger, usually the `__name__` of the calling module.
+        level (int, optional): Logging level set when the logger is first configured. Default is logging.INFO.
+
+    Returns:
+        logging.Logger: The configured logger object.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        with _default_logger_lock:
+            if not logger.handlers:
+                handler = logging.StreamHandler()
+                handler.setFormatter(logging.Formatter(DEFAULT_LOG_FORMAT))
+                logger.addHandler(handler)
+                logger.setLevel(level)
+                # Do not log twice if the root logger gets handlers
+                logger.propagate = False
+
+    return logger
@@ -4,8 +4,8 @@ Module for unzipping files and handling nested zip files.
 This module provides functionality for unzipping files. It includes the `extract_zip_file_recursive` function
 that extracts a given zip file and, if necessary, recursively extracts nested zip files to a specified destination.
 
-The module includes progress tracking and optional debug logging. It supports concurrent extraction for nested zip files
-and offers various command-line arguments to configure its behavior.
+The module includes progress tracking and optional debug logging. It extracts the entries of a zip file concurrently,
+supports recursive extraction of nested zip files and offers various command-line arguments to configure its behavior.
 
 Example Usage:
     To unzip a file named 'example.zip' to the directory 'output':
@@ -15,7 +15,14 @@ Example Usage:
     ```
 
 Attributes:
-- None
+- EXTRACT_BUFFER_SIZE (int): Size of the reads from the zip archive and writes to the extracted files in bytes.
+- DEFAULT_MAX_WORKERS (int): Default number of threads extracting the entries of a zip file.
+- MAX_PROCESSES (int): Maximum number of processes extracting the entries of a zip file.
+- NESTED_ZIP_MEMORY_LIMIT (int): Size in bytes up to which nested zip files are extracted from memory.
+- NESTED_ZIP_MEMORY_BUDGET (int): Total size in bytes of the nested zip files held in memory at once per process.
+
+If the optional `isal` (or else `zlib-ng`) package is installed, `zipfile` is patched on import to decode DEFLATE
+entries and compute their CRC-32 with it instead of `zlib`, which is several times faster.
 
 Functions:
 - extract_zip_file_recursive(
@@ -26,6 +33,11 @@ Functions:
     max_recursion_depth: Optional[int] = 1,
     logger: Optional[logging.Logger] = None,
     debug_logging: Optional[bool] = False,
+    max_workers: Optional[int] = None,
+    parallel: Optional[bool] = True,
+    buffer_size: Optional[int] = EXTRACT_BUFFER_SIZE,
+    zip_data: Optional[bytes] = None,
+    processes: Optional[int] = None,
 ):
     Recursively extracts the zip file and any nested zip files to a specified destination.
 
@@ -38,19 +50,93 @@ TODO:
 
 import argparse
 import concurrent.futures
+import io
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import shutil
+import signal
+import stat
+import struct
 import sys
+import threading
 import zipfile
-from typing import Optional
+import zlib
+from typing import List, Optional, Set, Tuple
 
 from tqdm import tqdm
 
+try:
+    # Optional, ISA-L's DEFLATE decoder is several times faster than zlib's
+    from isal import isal_zlib as fast_zlib
+except ImportError:
+    try:
+        # Optional, zlib-ng's DEFLATE decoder is faster than zlib's
+        from zlib_ng import zlib_ng as fast_zlib
+    except ImportError:
+        fast_zlib = None  # type: ignore[assignment]
+
 # Ensure the script knows the parent package
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.create_directory import create_directory
-from utils.logger_config import setup_logger
+from utils.logger_config import get_default_logger, setup_logger, stop_queue_listener
+
+# Size of the reads from the zip archive and of the writes to the extracted files
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+# Nested zip files up to this size in bytes are extracted from memory instead of being written to disk first
+NESTED_ZIP_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# Total size in bytes of the nested zip files all threads hold in memory at once, further nested zip files are
+# written to disk first while the budget is used up
+NESTED_ZIP_MEMORY_BUDGET = 4 * NESTED_ZIP_MEMORY_LIMIT
+
+# Minimum time in seconds between progress bar refreshes. Iterating a tqdm bar only counts the items between
+# refreshes, so this batches the progress updates of small files.
+PROGRESS_MIN_INTERVAL = 0.5
+
+# Flag bit of encrypted zip entries
+ZIP_FLAG_ENCRYPTED = 0x1
+
+# Indices of the file name and extra field lengths in a local file header unpacked with `zipfile.structFileHeader`
+LOCAL_HEADER_FILENAME_LENGTH = 10
+LOCAL_HEADER_EXTRA_FIELD_LENGTH = 11
+
+# "Version made by" host system of zip entries created on Unix, whose external attributes hold their permissions
+ZIP_CREATE_SYSTEM_UNIX = 3
+
+# Threads extracting the entries of a zip file, more mostly contend for the disk
+DEFAULT_MAX_WORKERS = min(16, os.cpu_count() or 1)
+
+# Processes extracting the entries of a zip file, beyond this the extraction scales no further
+MAX_PROCESSES = 16
+
+# Shards of a zip file per extracting process, more than one balances uneven shards and refreshes the progress bar
+SHARDS_PER_PROCESS = 4
+
+if fast_zlib is not None:
+    _get_decompressor = zipfile._get_decompressor
+
+    def _get_fast_decompressor(compress_type: int):
+        # Only DEFLATE decoding is replaced, compression (e.g. writing zip files elsewhere) still uses zlib
+        if compress_type == zipfile.ZIP_DEFLATED:
+            return fast_zlib.decompressobj(-15)
+
+        return _get_decompressor(compress_type)
+
+    zipfile._get_decompressor = _get_fast_decompressor
+    zipfile.crc32 = fast_zlib.crc32
+
+# CRC-32 used to verify entries copied without `zipfile`
+_crc32 = fast_zlib.crc32 if fast_zlib is not None else zlib.crc32
+
+# Directories known to exist, so entries of the same directories in later (nested) zip files skip the filesystem
+_created_directories: Set[str] = set()
+
+# Bytes of `NESTED_ZIP_MEMORY_BUDGET` reserved by the nested zip files currently held in memory
+_nested_zip_memory_used = 0
+_nested_zip_memory_lock = threading.Lock()
 
 
 def extract_zip_file_recursive(
@@ -61,6 +147,11 @@ def extract_zip_file_recursive(
     max_recursion_depth: Optional[int] = 1,
     logger: Optional[logging.Logger] = None,
     debug_logging: Optional[bool] = False,
+    max_workers: Optional[int] = None,
+    parallel: Optional[bool] = True,
+    buffer_size: Optional[int] = EXTRACT_BUFFER_SIZE,
+    zip_data: Optional[bytes] = None,
+    processes: Optional[int] = None,
 ) -> None:
     """
     Extracts a zip file to the specified destination directory and recursively extracts nested zip files.
@@ -73,6 +164,17 @@ def extract_zip_file_recursive(
         max_recursion_depth (Optional[int]): Maximum number of recursions before raising an error. Default is 1.
         logger (Optional[logging.Logger]): Logger instance for logging. If not provided, a new one will be created.
         debug_logging (Optional[bool]): Flag to toggle debug logging. Default is False.
+        max_workers (Optional[int]): Number of threads extracting the zip file entries concurrently, 1 extracts them
+            in the calling thread. Default is None (`DEFAULT_MAX_WORKERS`).
+        parallel (Optional[bool]): Flag to toggle concurrent extraction of the zip file entries, each worker reading
+            the zip file through its own handle. Nested zip files are always extracted serially. Default is True.
+        buffer_size (Optional[int]): Size of the reads from the zip file and writes to the extracted files in bytes.
+            Default is `EXTRACT_BUFFER_SIZE` (1 MiB).
+        zip_data (Optional[bytes]): Content of the zip file if it is already in memory, `zip_file` then only names it
+            in the logs and is not deleted. Default is None (the zip file is read from `zip_file`).
+        processes (Optional[int]): Number of processes extracting the zip file entries concurrently, so decompressing
+            and checking them is not serialized by the GIL. Capped at `MAX_PROCESSES`, and only used for zip files
+            read from disk. Default is None (the entries are extracted by threads, see `max_workers`).
 
     Raises:
         FileNotFoundError: If the zip file is not found.
@@ -82,93 +184,155 @@ def extract_zip_file_recursive(
     current_recursion_depth += 1
 
     if not logger or not logger.hasHandlers():
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.StreamHandler(),
-            ],
-        )
+        logger = get_default_logger(__name__)
 
-        logger = logging.getLogger()  # Get the root logger
+    # Pick the logging method once, `logger.debug` and `logger.info` return early on a disabled level
+    log = logger.debug if debug_logging else logger.info
 
     absolute_zip_file_path = os.path.abspath(zip_file)
-    logger.log(
-        logging.DEBUG if debug_logging else logging.INFO,
+    log(
         "Unzipping file process started with zip file: '%s' (current recursion depth: %s of %s)",
         absolute_zip_file_path,
         current_recursion_depth,
         max_recursion_depth,
     )
-    if not os.path.exists(absolute_zip_file_path):
+    if zip_data is None and not os.path.exists(absolute_zip_file_path):
         raise FileNotFoundError(f"Zip file not found: '{absolute_zip_file_path}'")
 
-    _ = create_directory(
-        destination=extract_to,
-        is_directory=True,
-        logger=logger,
-        debug_logging=debug_logging,
-    )
-
     absolute_extract_to_path = os.path.abspath(extract_to)
+    os.makedirs(absolute_extract_to_path, exist_ok=True)
     try:
-        with zipfile.ZipFile(absolute_zip_file_path, "r") as zip_ref:
-            name_list = zip_ref.namelist()  # Names of files in zip archive
-            total_files = len(name_list)
-            logger.log(
-                logging.DEBUG if debug_logging else logging.INFO,
+        with _open_zip_file(absolute_zip_file_path, zip_data) as zip_ref:
+            info_list = zip_ref.infolist()  # Entries of the zip archive
+            total_files = len(info_list)
+            log(
                 "zipfile extraction of '%s' files has started",
                 total_files,
             )
 
-            extracted_files = 0
-
-            if track_extraction:
-                # Use tqdm to display progress bar
-                with tqdm(total=total_files) as pbar:
-                    for file_info in zip_ref.infolist():
-                        extracted_files += 1
-
-                        pbar.update(1)
-
-                        extract(
-                            zip_ref=zip_ref,
-                            file_info=file_info,
-                            extract_to=extract_to,
-                            current_recursion_depth=current_recursion_depth,
-                            max_recursion_depth=max_recursion_depth,
-                            logger=logger,
-                            debug_logging=(
-                                True
-                                if current_recursion_depth >= 1 or track_extraction
-                                else debug_logging
-                            ),
-                        )
+            # Resolve the target path of each entry once, for both the directories and the extraction
+            item_paths = [
+                _get_target_path(file_info, absolute_extract_to_path)
+                for file_info in info_list
+            ]
+
+            # Create the parent directories of all files once upfront (parents first), instead of once per file
+            # (the extraction directory itself was created above)
+            directories = {
+                os.path.dirname(item_path)
+                for file_info, item_path in zip(info_list, item_paths)
+                if not file_info.is_dir()
+            } - {absolute_extract_to_path}
+            for directory in sorted(directories, key=lambda d: d.count(os.path.sep)):
+                if directory not in _created_directories:
+                    os.makedirs(directory, exist_ok=True)
+                    _created_directories.add(directory)
+
+            # Nested zip files log at debug level below the top level, or when the progress bar is shown
+            nested_debug_logging = bool(
+                debug_logging or track_extraction or current_recursion_depth >= 1
+            )
+
+            # Capture the arguments shared by all entries once, so only the entry is passed per call (positionally,
+            # without merging keyword arguments like `functools.partial` does)
+            def extract_entry(
+                entry_zip_ref: zipfile.ZipFile,
+                file_info: zipfile.ZipInfo,
+                item_path: str,
+            ) -> None:
+                extract(
+                    entry_zip_ref,
+                    file_info,
+                    absolute_extract_to_path,
+                    current_recursion_depth,
+                    max_recursion_depth,
+                    logger,
+                    nested_debug_logging,
+                    buffer_size,
+                    item_path,
+                )
+
+            if max_workers is None:
+                max_workers = DEFAULT_MAX_WORKERS
+
+            if parallel and processes and processes > 1 and zip_data is None:
+                _extract_with_processes(
+                    absolute_zip_file_path,
+                    info_list,
+                    absolute_extract_to_path,
+                    current_recursion_depth,
+                    max_recursion_depth,
+                    nested_debug_logging,
+                    buffer_size,
+                    min(processes, MAX_PROCESSES),
+                    track_extraction,
+                    logger,
+                )
+
+            elif not parallel or max_workers == 1:
+                # Extract in the calling thread, without the cost of starting a pool (e.g. per nested zip file)
+                for file_info, item_path in tqdm(
+                    zip(info_list, item_paths),
+                    total=total_files,
+                    disable=not track_extraction,
+                    mininterval=PROGRESS_MIN_INTERVAL,
+                ):
+                    extract_entry(zip_ref, file_info, item_path)
 
             else:
-                for file_info in zip_ref.infolist():
-                    extract(
-                        zip_ref=zip_ref,
-                        file_info=file_info,
-                        extract_to=extract_to,
-                        current_recursion_depth=current_recursion_depth,
-                        max_recursion_depth=max_recursion_depth,
-                        logger=logger,
-                        debug_logging=(
-                            True if current_recursion_depth >= 1 else debug_logging
-                        ),
-                    )
+                # Each worker reads the archive through its own handle, as reads through a shared handle are
+                # serialized by its lock
+                worker_state = threading.local()
+                worker_zip_refs: List[zipfile.ZipFile] = []
+
+                def extract_with_worker_handle(
+                    file_info: zipfile.ZipInfo, item_path: str
+                ) -> None:
+                    worker_zip_ref = getattr(worker_state, "zip_ref", None)
+                    if worker_zip_ref is None:
+                        worker_zip_ref = _open_zip_file(
+                            absolute_zip_file_path, zip_data
+                        )
+                        worker_state.zip_ref = worker_zip_ref
+                        worker_zip_refs.append(worker_zip_ref)
+
+                    extract_entry(worker_zip_ref, file_info, item_path)
+
+                # Nested zip files are extracted serially on the worker that found them, which already runs
+                # alongside the other workers, instead of multiplying the number of threads per nesting level
+                try:
+                    with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=max_workers
+                    ) as executor:
+                        futures = [
+                            executor.submit(
+                                extract_with_worker_handle, file_info, item_path
+                            )
+                            for file_info, item_path in zip(info_list, item_paths)
+                        ]
+
+                        # Use tqdm to display progress bar
+                        for future in tqdm(
+                            concurrent.futures.as_completed(futures),
+                            total=total_files,
+                            disable=not track_extraction,
+                            mininterval=PROGRESS_MIN_INTERVAL,
+                        ):
+                            future.result()  # Re-raise any error of the extraction
+
+                finally:
+                    for worker_zip_ref in worker_zip_refs:
+                        worker_zip_ref.close()
 
     except zipfile.BadZipFile:
         logger.exception("Invalid zip file: '%s'", absolute_zip_file_path)
         raise
 
     # Delete the zip file after successful extraction
-    if current_recursion_depth >= 1:
+    if current_recursion_depth >= 1 and zip_data is None:
         os.remove(zip_file)
 
-    logger.log(
-        logging.DEBUG if debug_logging else logging.INFO,
+    log(
         "Zip file extraction and deletion process has successfully completed (zip file: '%s' extracted to: '%s')",
         absolute_zip_file_path,
         absolute_extract_to_path,
@@ -183,6 +347,8 @@ def extract(
     max_recursion_depth: int,
     logger: logging.Logger,
     debug_logging: bool,
+    buffer_size: int = EXTRACT_BUFFER_SIZE,
+    item_path: Optional[str] = None,
 ) -> None:
     """
     Extracts a file from a zip archive.
@@ -195,41 +361,460 @@ def extract(
         max_recursion_depth (int): Maximum recursion depth.
         logger (logging.Logger): Logger instance for logging.
         debug_logging (bool): Flag to toggle debug logging.
+        buffer_size (int, optional): Size of the reads from the zip file and writes to the extracted file in bytes.
+            Default is `EXTRACT_BUFFER_SIZE` (1 MiB).
+        item_path (Optional[str]): Path the entry is extracted to, if already resolved. Default is None (resolved
+            from `extract_to` and the entry name).
     """
-    zip_ref.extract(file_info, extract_to)
-
-    # Extract nested zip files concurrently and recursively
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = []
-        for item in zip_ref.namelist():
-            item_path = os.path.join(extract_to, item)
-            if item.endswith(".zip") and zipfile.is_zipfile(item_path):
-                assert (
-                    current_recursion_depth <= max_recursion_depth
-                ), f"Maximum recursion limit reached ({max_recursion_depth})."
-
-                nested_extract_to = os.path.join(extract_to, os.path.splitext(item)[0])
-                os.makedirs(nested_extract_to, exist_ok=True)
-
-                futures.append(
-                    executor.submit(
-                        extract_zip_file_recursive,
-                        item_path,
-                        nested_extract_to,
-                        current_recursion_depth + 1,
-                        False,
-                        max_recursion_depth,
-                        logger,
-                        debug_logging,
+    if item_path is None:
+        item_path = _get_target_path(file_info, extract_to)
+    if file_info.is_dir():
+        os.makedirs(item_path, exist_ok=True)
+
+        return
+
+    # The cheap name check comes first, so only entries named like zip files (in any case) are checked further
+    is_zip_file_name = file_info.filename.lower().endswith(".zip")
+
+    # Extract small nested zip files from memory, without writing them to disk and reading them back. Nested zip
+    # files beyond the recursion limit take the on-disk path, so they are kept on disk when the limit is hit.
+    reserved_memory = (
+        is_zip_file_name
+        and file_info.file_size <= NESTED_ZIP_MEMORY_LIMIT
+        and current_recursion_depth <= max_recursion_depth
+        and _reserve_nested_zip_memory(file_info.file_size)
+    )
+    zip_data: Optional[bytes] = None
+    try:
+        if reserved_memory:
+            zip_data = zip_ref.read(file_info)
+            if zipfile.is_zipfile(io.BytesIO(zip_data)) and _extract_nested_zip_file(
+                item_path,
+                current_recursion_depth,
+                max_recursion_depth,
+                logger,
+                debug_logging,
+                buffer_size,
+                zip_data=zip_data,
+            ):
+                return
+
+        try:
+            target = open(item_path, "wb", buffering=0)
+
+        except FileNotFoundError:
+            # The parent directory was not created upfront (or was removed since), create it now
+            os.makedirs(os.path.dirname(item_path), exist_ok=True)
+            target = open(item_path, "wb", buffering=0)
+
+        with target:
+            if zip_data is not None:
+                # Not a zip file after all, or its extraction failed
+                target.write(zip_data)
+
+            elif not _copy_stored_entry(zip_ref, file_info, target):
+                # Stream the entry with a large buffer instead of `ZipFile.extract`, which copies in small chunks
+                with zip_ref.open(file_info) as source:
+                    # Do not allocate a full buffer for small files
+                    shutil.copyfileobj(
+                        source,
+                        target,
+                        min(buffer_size, file_info.file_size) or buffer_size,
                     )
+
+    finally:
+        if reserved_memory:
+            zip_data = None  # Drop the buffer before returning its size to the budget
+            _release_nested_zip_memory(file_info.file_size)
+
+    # Restore the permissions of entries created on Unix (e.g. executable bits), keeping the file readable
+    # and writable by its owner so it can be extracted again
+    mode = (file_info.external_attr >> 16) & 0o777
+    if file_info.create_system == ZIP_CREATE_SYSTEM_UNIX and mode:
+        os.chmod(item_path, mode | stat.S_IRUSR | stat.S_IWUSR)
+
+    # Extract the entry recursively if it is a large nested zip file. Only the entry just extracted is
+    # checked, so each nested zip file is found (and extracted) exactly once.
+    if is_zip_file_name and not reserved_memory and zipfile.is_zipfile(item_path):
+        _extract_nested_zip_file(
+            item_path,
+            current_recursion_depth,
+            max_recursion_depth,
+            logger,
+            debug_logging,
+            buffer_size,
+        )
+
+
+def _extract_nested_zip_file(
+    item_path: str,
+    current_recursion_depth: int,
+    max_recursion_depth: int,
+    logger: logging.Logger,
+    debug_logging: bool,
+    buffer_size: int,
+    zip_data: Optional[bytes] = None,
+) -> bool:
+    """
+    Extracts a nested zip file next to it, into a directory named after it without the ".zip" extension.
+
+    Args:
+        item_path (str): Path the nested zip file was (or would have been) extracted to.
+        current_recursion_depth (int): Current recursion depth.
+        max_recursion_depth (int): Maximum recursion depth.
+        logger (logging.Logger): Logger instance for logging.
+        debug_logging (bool): Flag to toggle debug logging.
+        buffer_size (int): Size of the reads from the zip file and writes to the extracted files in bytes.
+        zip_data (Optional[bytes]): Content of the nested zip file if it is held in memory instead of on disk.
+            Default is None.
+
+    Returns:
+        bool: True if the nested zip file was extracted, False if an error occurred (and was logged).
+
+    Raises:
+        AssertionError: If maximum recursion depth is reached.
+    """
+    assert (
+        current_recursion_depth <= max_recursion_depth
+    ), f"Maximum recursion limit reached ({max_recursion_depth})."
+
+    try:
+        extract_zip_file_recursive(
+            item_path,
+            item_path[: -len(".zip")],
+            current_recursion_depth + 1,
+            False,
+            max_recursion_depth,
+            logger,
+            debug_logging,
+            parallel=False,
+            buffer_size=buffer_size,
+            zip_data=zip_data,
+        )
+    except Exception as e:
+        logger.error("Error occurred: %s", e)
+
+        return False
+
+    return True
+
+
+def _extract_with_processes(
+    zip_file: str,
+    info_list: List[zipfile.ZipInfo],
+    extract_to: str,
+    current_recursion_depth: int,
+    max_recursion_depth: int,
+    debug_logging: bool,
+    buffer_size: int,
+    processes: int,
+    track_extraction: bool,
+    logger: logging.Logger,
+) -> None:
+    """
+    Extracts the entries of a zip file on a pool of processes, each opening the zip file itself.
+
+    The entries are dealt round-robin by descending compressed size into `SHARDS_PER_PROCESS` shards per process, so
+    the shards take about as long to extract. Shards are passed as entry indices rather than names, which also
+    addresses entries sharing a name. The processes log through a queue to `logger` of this process, so their
+    records reach the same handlers (e.g. the log file) as those of the other extraction modes.
+
+    Args:
+        zip_file (str): Absolute path to the zip file to be extracted.
+        info_list (List[zipfile.ZipInfo]): Entries of the zip file, in the order of `ZipFile.infolist`.
+        extract_to (str): Absolute path to the directory where the zip file contents will be extracted to.
+        current_recursion_depth (int): Current recursion depth.
+        max_recursion_depth (int): Maximum recursion depth.
+        debug_logging (bool): Flag to toggle debug logging.
+        buffer_size (int): Size of the reads from the zip file and writes to the extracted files in bytes.
+        processes (int): Number of processes extracting the entries.
+        track_extraction (bool): Flag to toggle zipfile extraction tracking in the console.
+        logger (logging.Logger): Logger instance the records of the processes are handed to.
+    """
+    shard_count = min(processes * SHARDS_PER_PROCESS, len(info_list)) or 1
+    indices = sorted(
+        range(len(info_list)),
+        key=lambda index: info_list[index].compress_size,
+        reverse=True,
+    )
+    shards = [indices[shard::shard_count] for shard in range(shard_count)]
+
+    # Spawn the processes instead of forking them, forking copies the locks held by the logging threads of this
+    # process in whatever state they are in
+    mp_context = multiprocessing.get_context("spawn")
+
+    # Hand the records of the processes to the logger, which applies its filters and handlers as for records
+    # logged in this process (the processes only send records of the logger's level)
+    log_queue = mp_context.Queue()
+    log_listener = logging.handlers.QueueListener(log_queue, logger)  # type: ignore[arg-type]
+    log_listener.start()
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=mp_context,
+            initializer=_init_extraction_process,
+            initargs=(log_queue, logger.getEffectiveLevel()),
+        ) as executor, tqdm(
+            total=len(info_list),
+            disable=not track_extraction,
+            mininterval=PROGRESS_MIN_INTERVAL,
+        ) as progress_bar:
+            futures = [
+                executor.submit(
+                    _extract_shard,
+                    (zip_file, shard, extract_to),
+                    current_recursion_depth,
+                    max_recursion_depth,
+                    debug_logging,
+                    buffer_size,
                 )
+                for shard in shards
+            ]
+
+            for future in concurrent.futures.as_completed(futures):
+                # Re-raise any error of the extraction
+                progress_bar.update(future.result())
+
+    finally:
+        log_listener.stop()  # Hands over the records still queued
+
+
+def _init_extraction_process(log_queue: "multiprocessing.Queue", level: int) -> None:
+    """
+    Initializes a process extracting zip file shards.
+
+    Importing this module in the process (to unpickle the first shard) imports `zipfile` and the optional fast
+    DEFLATE decoder, and patches `zipfile` with it. The logger of this module sends its records to the parent
+    process through `log_queue`. Ctrl+C is left to the parent process, which shuts the pool down.
+
+    Args:
+        log_queue (multiprocessing.Queue): Queue the parent process hands the records to its logger from.
+        level (int): Level of the logger of the parent process.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    logger = logging.getLogger(__name__)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def _extract_shard(
+    shard: Tuple[str, List[int], str],
+    current_recursion_depth: int,
+    max_recursion_depth: int,
+    debug_logging: bool,
+    buffer_size: int,
+) -> int:
+    """
+    Extracts a shard of the entries of a zip file, run in a process of the pool of `_extract_with_processes`.
+
+    Args:
+        shard (Tuple[str, List[int], str]): Path to the zip file, indices of the entries to extract in
+            `ZipFile.infolist` and path to the directory where they will be extracted to.
+        current_recursion_depth (int): Current recursion depth.
+        max_recursion_depth (int): Maximum recursion depth.
+        debug_logging (bool): Flag to toggle debug logging.
+        buffer_size (int): Size of the reads from the zip file and writes to the extracted files in bytes.
+
+    Returns:
+        int: Number of entries extracted.
+    """
+    zip_file, indices, extract_to = shard
+
+    # Set up by `_init_extraction_process` to send its records to the parent process
+    logger = logging.getLogger(__name__)
+
+    with zipfile.ZipFile(zip_file, "r") as zip_ref:
+        info_list = zip_ref.infolist()
+        for index in indices:
+            file_info = info_list[index]
+            extract(
+                zip_ref,
+                file_info,
+                extract_to,
+                current_recursion_depth,
+                max_recursion_depth,
+                logger,
+                debug_logging,
+                buffer_size,
+                _get_target_path(file_info, extract_to),
+            )
+
+    return len(indices)
+
+
+def _reserve_nested_zip_memory(size: int) -> bool:
+    """
+    Reserves memory for a nested zip file out of `NESTED_ZIP_MEMORY_BUDGET`, without waiting for it.
+
+    Args:
+        size (int): Size of the nested zip file in bytes.
+
+    Returns:
+        bool: True if the memory was reserved (release it with `_release_nested_zip_memory`), False if the budget
+            is used up and the nested zip file has to be extracted on disk.
+    """
+    global _nested_zip_memory_used
+
+    with _nested_zip_memory_lock:
+        if _nested_zip_memory_used + size > NESTED_ZIP_MEMORY_BUDGET:
+            return False
+
+        _nested_zip_memory_used += size
+
+    return True
+
+
+def _release_nested_zip_memory(size: int) -> None:
+    """
+    Returns memory reserved by `_reserve_nested_zip_memory` to `NESTED_ZIP_MEMORY_BUDGET`.
+
+    Args:
+        size (int): Size of the nested zip file in bytes, as reserved.
+    """
+    global _nested_zip_memory_used
+
+    with _nested_zip_memory_lock:
+        _nested_zip_memory_used -= size
 
-        # Wait for all tasks to complete
-        for future in concurrent.futures.as_completed(futures):
-            try:
-                future.result()
-            except Exception as e:
-                logger.error("Error occurred: %s", e)
+
+def _open_zip_file(zip_file: str, zip_data: Optional[bytes]) -> zipfile.ZipFile:
+    """
+    Opens a zip file for reading, from memory if its content is given.
+
+    Args:
+        zip_file (str): Path to the zip file.
+        zip_data (Optional[bytes]): Content of the zip file, or None to read it from `zip_file`.
+
+    Returns:
+        zipfile.ZipFile: The opened zip file.
+    """
+    if zip_data is not None:
+        return zipfile.ZipFile(io.BytesIO(zip_data), "r")
+
+    return zipfile.ZipFile(zip_file, "r")
+
+
+def _copy_stored_entry(
+    zip_ref: zipfile.ZipFile, file_info: zipfile.ZipInfo, target: io.FileIO
+) -> bool:
+    """
+    Copies an uncompressed (stored) zip file entry to the target file within the kernel, using `os.copy_file_range`.
+
+    Stored entries (e.g. already compressed images) are byte ranges of the archive, so they can be copied without
+    reading them into Python. As with `ZipFile.open`, the CRC-32 of the entry is verified: it is computed over the
+    copied range of the archive afterwards, which is then still in the page cache, so a corrupt archive raises
+    `zipfile.BadZipFile` instead of extracting silently.
+
+    Args:
+        zip_ref (zipfile.ZipFile): ZipFile object representing the zip archive.
+        file_info (zipfile.ZipInfo): Information about the file to be extracted.
+        target (io.FileIO): Unbuffered file the entry is extracted to, positioned at its start.
+
+    Returns:
+        bool: True if the entry was copied, False if it has to be extracted through `ZipFile.open` (compressed or
+            encrypted entry, or no `os.copy_file_range` support by the OS or file system).
+
+    Raises:
+        zipfile.BadZipFile: If the CRC-32 of the copied entry does not match the one stored in the zip file.
+    """
+    if (
+        not hasattr(os, "copy_file_range")
+        or file_info.compress_type != zipfile.ZIP_STORED
+        or file_info.flag_bits & ZIP_FLAG_ENCRYPTED
+    ):
+        return False
+
+    try:
+        source_fd = zip_ref.fp.fileno()
+
+        # The entry data follows its local file header, whose file name and extra field lengths can differ
+        # from the central directory
+        header = os.pread(source_fd, zipfile.sizeFileHeader, file_info.header_offset)
+        if len(header) != zipfile.sizeFileHeader:
+            return False
+
+        fields = struct.unpack(zipfile.structFileHeader, header)
+        if fields[0] != zipfile.stringFileHeader:
+            return False
+
+        data_offset = (
+            file_info.header_offset
+            + zipfile.sizeFileHeader
+            + fields[LOCAL_HEADER_FILENAME_LENGTH]
+            + fields[LOCAL_HEADER_EXTRA_FIELD_LENGTH]
+        )
+        offset = data_offset
+        remaining = file_info.file_size
+        while remaining:
+            copied = os.copy_file_range(
+                source_fd, target.fileno(), remaining, offset_src=offset
+            )
+            if not copied:
+                raise EOFError(f"Truncated zip file entry: '{file_info.filename}'")
+
+            offset += copied
+            remaining -= copied
+
+        # Read the copied range back for its CRC-32, as `ZipFile.open` checks it
+        end = data_offset + file_info.file_size
+        crc = 0
+        for offset in range(data_offset, end, EXTRACT_BUFFER_SIZE):
+            crc = _crc32(
+                os.pread(source_fd, min(EXTRACT_BUFFER_SIZE, end - offset), offset), crc
+            )
+
+    except (AttributeError, io.UnsupportedOperation, OSError, EOFError):
+        # Start over through `ZipFile.open`, which also reports truncated entries properly
+        target.seek(0)
+        target.truncate()
+
+        return False
+
+    if crc != file_info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file '{file_info.filename}'")
+
+    return True
+
+
+def _get_target_path(file_info: zipfile.ZipInfo, extract_to: str) -> str:
+    """
+    Get the path a zip file entry is extracted to, sanitized the same way as `ZipFile.extract` does.
+
+    Args:
+        file_info (zipfile.ZipInfo): Information about the file to be extracted.
+        extract_to (str): Path to the directory where the file will be extracted to.
+
+    Returns:
+        str: Path the entry is extracted to.
+    """
+    filename = file_info.filename
+
+    # Plain relative names need no sanitizing, so skip splitting and joining them for most entries
+    if (
+        os.path.sep == "/"
+        and not filename.startswith(("/", "."))
+        and "/." not in filename
+        and "//" not in filename
+    ):
+        return extract_to + "/" + filename
+
+    arcname = filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+
+    # Interpret absolute paths as relative and remove drive letters, redundant separators, "." and ".."
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_path_parts = ("", os.path.curdir, os.path.pardir)
+    arcname = os.path.sep.join(
+        part for part in arcname.split(os.path.sep) if part not in invalid_path_parts
+    )
+    if os.path.sep == "\\":
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)
+
+    return os.path.normpath(os.path.join(extract_to, arcname))
 
 
 def main() -> None:
@@ -266,6 +851,18 @@ def main() -> None:
         default="./configs/logging.yaml",
         help="Path to yaml_config_path for logger.",
     )
+    parser.add_argument(
+        "--buffer_size",
+        type=int,
+        default=EXTRACT_BUFFER_SIZE,
+        help="Size of the reads from the zip file and writes to the extracted files in bytes.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Number of processes extracting the zip file entries, at most {MAX_PROCESSES} (1 extracts them on threads).",
+    )
     parser.add_argument(
         "--debug_logging",
         type=bool,
@@ -281,6 +878,14 @@ def main() -> None:
     max_recursion_depth = args.max_recursion_depth
     yaml_config_path = args.yaml_config_path
     debug_logging = args.debug_logging
+    buffer_size = args.buffer_size
+    if buffer_size < 1:
+        raise ValueError(f"The buffer size must be at least 1. Received {buffer_size}")
+    workers = args.workers
+    if workers < 1:
+        raise ValueError(
+            f"The number of extraction processes must be at least 1. Received {workers}"
+        )
 
     # Set up logging
     logger: logging.Logger = setup_logger(
@@ -288,15 +893,23 @@ def main() -> None:
         log_output_file_path=zip_file,
     )
 
-    extract_zip_file_recursive(
-        zip_file=zip_file,
-        extract_to=extract_to,
-        current_recursion_depth=-1,
-        track_extraction=track_extraction,
-        max_recursion_depth=max_recursion_depth,
-        logger=logger,
-        debug_logging=debug_logging,
-    )
+    try:
+        extract_zip_file_recursive(
+            zip_file=zip_file,
+            extract_to=extract_to,
+            current_recursion_depth=-1,
+            track_extraction=track_extraction,
+            max_recursion_depth=max_recursion_depth,
+            logger=logger,
+            debug_logging=debug_logging,
+            buffer_size=buffer_size,
+            processes=workers,
+        )
+
+    finally:
+        # Write the queued and buffered records, also when interrupted
+        stop_queue_listener()
+        logging.shutdown()
 
 
 if __name__ == "__main__":
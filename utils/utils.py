@@ -3,13 +3,18 @@ This module provides general utility functions including loading configuration d
 and monitoring system resources such as CPU and memory usage.
 
 The `load_yaml_config` function reads a specified YAML file and returns its contents as a Python dictionary.
-If the YAML file does not exist at the specified path, a `FileNotFoundError` is raised.
+If the YAML file does not exist at the specified path, a `FileNotFoundError` is raised. Parsed files are cached
+and only parsed again once their modification time or size changes, both in memory and across processes as JSON
+files (which load much faster than YAML) in `YAML_JSON_CACHE_DIRECTORY`, one file per YAML file.
 
 The `monitor_resources` function continuously displays the current CPU and memory usage, updating once per second.
 It also includes a signal handler to handle `SIGINT` for graceful termination.
 
 Attributes:
 ENCODING (str): The character encoding used for reading the YAML file.
+YAML_CACHE_SIZE (int): The maximum number of parsed YAML files kept in the cache.
+YAML_JSON_CACHE_DIRECTORY (str): The directory where parsed YAML files are cached as JSON, in the user's cache
+    directory (`$XDG_CACHE_HOME`, or else `~/.cache`).
 
 Functions:
 - load_yaml_config(yaml_path: str) -> dict:
@@ -22,32 +27,141 @@ Functions:
   Handles `SIGINT` (Ctrl+C) for graceful termination during resource monitoring.
 """
 
+import copy
+import hashlib
+import json
+import logging
 import os
 import signal
 import sys
+import threading
 import time
+from collections import OrderedDict
+from typing import Any, Tuple
 
 import psutil
 import yaml
 
+try:
+    # libyaml's C parser, several times faster than the pure Python one
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlSafeLoader
+
 ENCODING = "utf-8"
+YAML_CACHE_SIZE = 100
+YAML_JSON_CACHE_DIRECTORY = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "sfai_cap3d_download",
+    "yaml",
+)
+
+# Parsed YAML files by path, stored with the modification time and size they were parsed at
+_yaml_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_yaml_cache_lock = threading.Lock()
 
 
 def load_yaml_config(yaml_path: str):
     """
     Load configuration from a YAML file.
 
+    The parsed configuration is cached, and reused as long as the file's modification time and size are unchanged.
+    A copy is returned, so callers can modify it without affecting the cache.
+
     Args:
         yaml_path (str): Path to the YAML file containing configurations.
 
     Returns:
         dict: The loaded configuration.
     """
-    if not os.path.exists(yaml_path):
-        raise FileNotFoundError(f"YAML configuration file '{yaml_path}' not found.")
+    # A single stat instead of an existence check followed by reading the file, which also provides the cache key
+    try:
+        stat_result = os.stat(yaml_path)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(
+            f"YAML configuration file '{yaml_path}' not found."
+        ) from e
+
+    cache_key = os.path.abspath(yaml_path)
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(cache_key)
+        if cached is not None and cached[:2] == (
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+        ):
+            _yaml_cache.move_to_end(cache_key)
+
+            return copy.deepcopy(cached[2])
+
+    config = _load_yaml_file(yaml_path, stat_result)
+
+    with _yaml_cache_lock:
+        _yaml_cache[cache_key] = (
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+            config,
+        )
+        _yaml_cache.move_to_end(cache_key)
+        if len(_yaml_cache) > YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)  # Evict the least recently used file
+
+    return copy.deepcopy(config)
+
+
+def _load_yaml_file(yaml_path: str, stat_result: os.stat_result) -> Any:
+    """
+    Parse a YAML file, or load it from its JSON cache file if the YAML file is unchanged since it was cached.
+
+    The JSON cache file name is derived from the absolute path of the YAML file, and the file is overwritten
+    whenever the YAML file is parsed again, so each YAML file has a single cache file. The cache file stores the
+    modification time and size of the YAML file it was parsed from, so a modified YAML file never matches a stale
+    cache file. Configurations that do not survive a round trip through JSON unchanged (e.g. with dates or
+    non-string keys) are not cached.
+
+    Args:
+        yaml_path (str): Path to the YAML file.
+        stat_result (os.stat_result): Metadata of the YAML file.
+
+    Returns:
+        Any: The parsed YAML file.
+    """
+    cache_key = hashlib.blake2b(
+        os.path.abspath(yaml_path).encode(ENCODING), digest_size=16
+    ).hexdigest()
+    cache_path = os.path.join(YAML_JSON_CACHE_DIRECTORY, f"{cache_key}.json")
+    cache_id = [stat_result.st_mtime_ns, stat_result.st_size]
+
+    try:
+        with open(cache_path, "r", encoding=ENCODING) as f:
+            cached = json.load(f)
 
-    with open(yaml_path, "r", encoding=ENCODING) as f:
-        config = yaml.safe_load(f)
+        if cached["id"] == cache_id:
+            return cached["config"]
+
+    except (OSError, ValueError, TypeError, KeyError):
+        pass  # Not cached yet (or unreadable), parse the YAML file
+
+    try:
+        with open(yaml_path, "r", encoding=ENCODING) as f:
+            config = yaml.load(f, Loader=YamlSafeLoader)
+    except FileNotFoundError as e:  # Removed since it was stat'ed
+        raise FileNotFoundError(
+            f"YAML configuration file '{yaml_path}' not found."
+        ) from e
+
+    try:
+        serialized_config = json.dumps({"id": cache_id, "config": config})
+        if json.loads(serialized_config)["config"] == config:
+            os.makedirs(YAML_JSON_CACHE_DIRECTORY, exist_ok=True)
+
+            # Write to a temporary file first, so concurrent processes never read a partial cache file
+            temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding=ENCODING) as f:
+                f.write(serialized_config)
+            os.replace(temporary_path, cache_path)
+
+    except (OSError, TypeError, ValueError):
+        pass  # Caching is best effort (e.g. read-only directory or values JSON cannot represent)
 
     return config
 
@@ -61,24 +175,26 @@ def monitor_resources():
     Returns:
         None
     """
+    # Prime the CPU usage counters, later calls return the usage since the previous call without blocking
+    psutil.cpu_percent(interval=None)
+
+    # Fixed width fields, so a shorter line fully overwrites the previous one
+    format_output = "CPU Usage: {:>5.1f}%   Memory Usage: {:>5.1f}%".format
+
+    start = time.monotonic()
     while True:
+        # Pause execution until the next full second since the start, so the time spent sampling and printing
+        # does not make the samples drift
+        time.sleep(1.0 - (time.monotonic() - start) % 1.0)
+
         # Get CPU usage
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = psutil.cpu_percent(interval=None)
         # Get memory usage
         mem = psutil.virtual_memory()
         mem_percent = mem.percent
 
-        # Construct the output string
-        output_string = f"CPU Usage: {cpu_percent}%   Memory Usage: {mem_percent}%"
-
-        # Print the output string with a carriage return to overwrite the previous line
-        print(output_string, end="\r")
-
-        # Flush the output buffer to ensure the line is immediately printed
-        sys.stdout.flush()
-
-        # Pause execution for one second
-        time.sleep(1)
+        # Print the output with a carriage return to overwrite the previous line, flushed immediately
+        print(format_output(cpu_percent, mem_percent), end="\r", flush=True)
 
 
 def signal_handler(sig, frame):
@@ -86,6 +202,7 @@ def signal_handler(sig, frame):
     Signal handler for SIGINT (Ctrl+C).
     """
     print("\nExiting gracefully...")
+    logging.shutdown()  # Flush and close all handlers before exiting
     sys.exit(0)
 
 